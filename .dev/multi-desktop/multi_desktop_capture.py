@@ -5,32 +5,259 @@ Multi-Desktop Screenshot Capture
 Extends sccpt to capture from multiple virtual desktops/monitors simultaneously.
 """
 
+import io
 import json
+import re
+import shutil
 import subprocess
+import time
+import traceback
 import base64
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
 from typing import List, Optional, Dict
 import sys
 import os
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
 # Add src to path for development
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
 
+# One `wmctrl -d` line: desktop id, up to eight fixed fields, then the name
+_WMCTRL_RE = re.compile(r"^[ \t]*(\S+)((?:[ \t]+\S+){0,8})(?:[ \t]+(.+?))?[ \t]*$", re.MULTILINE)
+
+
+def _parse_wmctrl(text: str) -> List[Dict]:
+    """
+    Parse `wmctrl -d` output into desktop entries.
+
+    Args:
+        text: Raw stdout of `wmctrl -d`
+
+    Returns:
+        List of {"id": ..., "name": ...} dictionaries
+    """
+    desktops = []
+    for m in _WMCTRL_RE.finditer(text):
+        desktop_id, fields, name = m.groups()
+        if name is None:
+            # Short line: fall back to its last field
+            fields = fields.split()
+            if not fields:
+                continue
+            name = fields[-1] if len(fields) >= 2 else f"Desktop {desktop_id}"
+        desktops.append({"id": desktop_id, "name": name})
+    return desktops
+
+
+# File extension for each supported output format
+_EXTENSIONS = {"jpeg": ".jpg", "webp": ".webp", "png": ".png"}
+
+# Characters unsafe or noisy in capture filenames, mapped in one pass
+_FN_TRANS = str.maketrans({"\\": "_", ".": "_", " ": "_", "/": "_"})
+
+# Platform check done once at import; the kernel release never changes
+try:
+    _IS_WSL = sys.platform == "linux" and "microsoft" in os.uname().release.lower()
+except AttributeError:
+    # os.uname() is not available on non-POSIX platforms
+    _IS_WSL = False
+
+# PowerShell locations, in preference order (PATH lookup, then default install)
+_PS_CANDIDATES = (
+    "powershell.exe",
+    "/mnt/c/Windows/System32/WindowsPowerShell/v1.0/powershell.exe",
+)
+
+
+def _find_powershell() -> Optional[str]:
+    """
+    Locate the PowerShell executable with stat calls only (no spawn).
+
+    shutil.which() handles both bare names (PATH lookup) and absolute
+    paths, checking that the file exists and is executable.
+    """
+    for candidate in _PS_CANDIDATES:
+        found = shutil.which(candidate)
+        if found:
+            return found
+    return None
+
+
+def _windows_to_wsl_path(path: str) -> str:
+    """Map a Windows path such as C:\\Temp\\x.png to /mnt/c/Temp/x.png."""
+    if len(path) >= 2 and path[1] == ":":
+        return f"/mnt/{path[0].lower()}" + path[2:].replace("\\", "/")
+    return path
+
+
+# Shared libjpeg-turbo encoder; False once PyTurboJPEG is known to be missing
+_jpeg_encoder = None
+
+
+def _get_jpeg_encoder():
+    """Return a TurboJPEG encoder, or None if PyTurboJPEG is unavailable."""
+    global _jpeg_encoder
+    if _jpeg_encoder is None:
+        try:
+            import numpy  # noqa: F401  (TurboJPEG.encode takes ndarrays)
+            from turbojpeg import TurboJPEG
+            _jpeg_encoder = TurboJPEG()
+        except Exception:
+            _jpeg_encoder = False
+    return _jpeg_encoder or None
+
+
+def _save_jpeg(img, out_path: str) -> None:
+    """
+    Save a PIL image as JPEG at quality 85.
+
+    Uses libjpeg-turbo when available; otherwise Pillow without the
+    Huffman optimize pass, which roughly doubles encode time.
+    """
+    tj = _get_jpeg_encoder()
+    if tj:
+        import numpy as np
+        from turbojpeg import TJPF_RGB
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        Path(out_path).write_bytes(
+            tj.encode(np.asarray(img), quality=85, pixel_format=TJPF_RGB))
+    else:
+        img.save(out_path, 'JPEG', quality=85)
+
+
+def _save_image(img, out_path: str, image_format: str = "jpeg") -> None:
+    """Save a PIL image as JPEG, WebP or PNG."""
+    if image_format == "webp":
+        # method=4 is the speed/size sweet spot for screen content
+        img.save(out_path, 'WEBP', quality=85, method=4)
+    elif image_format == "png":
+        img.save(out_path, 'PNG')
+    else:
+        _save_jpeg(img, out_path)
+
+
+def _needs_resize(screen: Dict, max_dimension: Optional[int]) -> bool:
+    """Whether a screen must be downscaled (unknown bounds count as yes)."""
+    if not max_dimension:
+        return False
+    bounds = screen.get("Bounds") or {}
+    width, height = bounds.get("Width"), bounds.get("Height")
+    if width is None or height is None:
+        return True
+    return max(width, height) > max_dimension
+
+
+def _downscale(img, max_dimension: Optional[int]):
+    """Shrink img in place to fit max_dimension (BILINEAR: LANCZOS is too slow)."""
+    if max_dimension and max(img.size) > max_dimension:
+        img.thumbnail((max_dimension, max_dimension), Image.BILINEAR)
+    return img
+
+
+def _encode_one_screen(screen: Dict, out_path: str, image_format: str = "jpeg",
+                       max_dimension: Optional[int] = None) -> str:
+    """
+    Save one captured screen, re-encoding only if its format differs.
+
+    Module-level so it can be dispatched to worker processes.
+
+    Args:
+        screen: Screen entry from capture_all_desktops.ps1 output
+        out_path: Destination image path
+        image_format: Output format ("jpeg", "webp" or "png")
+        max_dimension: Downscale so the longest side fits this (None = native)
+
+    Returns:
+        Path actually written (PNG if PIL is unavailable)
+    """
+    temp_path = screen.get("TempPath")
+
+    # Already encoded by GDI+ in the wanted format and size; just move the bytes
+    if screen.get("Format", "png") == image_format and not _needs_resize(screen, max_dimension):
+        if temp_path:
+            shutil.move(_windows_to_wsl_path(temp_path), out_path)
+        else:
+            Path(out_path).write_bytes(base64.b64decode(screen.get("Base64Data", "")))
+        return out_path
+
+    if temp_path:
+        # Raw image written by PowerShell; skips the base64/JSON round-trip
+        temp_file = Path(_windows_to_wsl_path(temp_path))
+        img_data = temp_file.read_bytes()
+        temp_file.unlink(missing_ok=True)
+    else:
+        img_data = base64.b64decode(screen.get("Base64Data", ""))
+
+    # Re-encode with PIL
+    if Image is not None:
+        img = Image.open(io.BytesIO(img_data))
+        if img.mode == 'RGBA':
+            # Screen alpha is always opaque; drop it without a blend pass
+            img = img.convert('RGB')
+        _save_image(_downscale(img, max_dimension), out_path, image_format)
+    else:
+        # Fallback to PNG if PIL not available
+        out_path = str(Path(out_path).with_suffix('.png'))
+        with open(out_path, 'wb') as f:
+            f.write(img_data)
+
+    return out_path
+
+
+def _save_grab(shot, out_path: str, image_format: str = "jpeg",
+               max_dimension: Optional[int] = None) -> str:
+    """Encode an mss grab (runs on a background thread)."""
+    img = Image.frombytes("RGB", shot.size, shot.bgra, "raw", "BGRX")
+    _save_image(_downscale(img, max_dimension), out_path, image_format)
+    return out_path
+
+
 class MultiDesktopCapture:
     """Capture screenshots from multiple virtual desktops/monitors."""
 
-    def __init__(self, output_dir: str = None, verbose: bool = True):
+    def __init__(self, output_dir: str = None, verbose: bool = True,
+                 persistent: bool = False, image_format: str = "jpeg",
+                 max_dimension: Optional[int] = None):
         """
         Initialize multi-desktop capture.
 
         Args:
-            output_dir: Directory to save screenshots (defaults to ~/.cache/sccpt/multi-desktop)
+            output_dir: Directory to save screenshots (defaults to
+                /dev/shm/sccpt/multi-desktop, or ~/.cache/sccpt/multi-desktop
+                when persistent or tmpfs is unavailable)
             verbose: Enable verbose output
+            persistent: Keep default output on disk instead of tmpfs
+            image_format: "jpeg" (encoded by GDI+ on WSL), "webp" (smaller,
+                re-encoded by PIL) or "png" (lossless)
+            max_dimension: Downscale captures so their longest side fits
+                this many pixels before encoding (e.g. for LLM input)
         """
+        if image_format not in _EXTENSIONS:
+            raise ValueError(f"Unsupported image_format: {image_format!r}")
+        self.image_format = image_format
+        self._ext = _EXTENSIONS[image_format]
+        self.max_dimension = max_dimension
+
         if output_dir is None:
-            output_dir = Path.home() / ".cache" / "sccpt" / "multi-desktop"
+            if not persistent and os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+                # tmpfs: no disk I/O, and never the slow /mnt/c 9P mount on WSL
+                output_dir = Path("/dev/shm") / "sccpt" / "multi-desktop"
+                if verbose:
+                    print("⚠️  Saving to tmpfs; screenshots are lost on reboot (use persistent=True to keep them)")
+            else:
+                output_dir = Path.home() / ".cache" / "sccpt" / "multi-desktop"
 
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -39,6 +266,15 @@ class MultiDesktopCapture:
         # Detect platform
         self.is_wsl = self._is_wsl()
 
+        # Resolve PowerShell once; every capture/enumeration reuses it
+        self._ps_exe = _find_powershell() if self.is_wsl else None
+
+        # Enumeration returned alongside the last fused capture
+        self._enumeration_cache = None
+
+        # In-process X11 grabber (MIT-SHM), reused across captures
+        self._sct = self._open_mss() if not self.is_wsl else None
+
         if self.verbose:
             platform = "WSL" if self.is_wsl else "Native Linux"
             print(f"🖥️  Multi-Desktop Capture initialized ({platform})")
@@ -46,15 +282,31 @@ class MultiDesktopCapture:
 
     def _is_wsl(self) -> bool:
         """Check if running in WSL."""
-        return sys.platform == "linux" and "microsoft" in os.uname().release.lower()
+        return _IS_WSL
+
+    def _open_mss(self):
+        """Open an mss grabber, or return None if mss/X11 is unavailable."""
+        try:
+            import mss
+            return mss.mss()
+        except Exception:
+            return None
 
-    def enumerate_desktops(self) -> Dict:
+    def enumerate_desktops(self, refresh: bool = False) -> Dict:
         """
         Enumerate all available virtual desktops/monitors.
 
+        Args:
+            refresh: Ignore enumeration cached by a previous capture
+
         Returns:
             Dictionary with desktop information
         """
+        if self._enumeration_cache is not None and not refresh:
+            if self.verbose:
+                print("\n🔍 Using enumeration from last capture")
+            return self._enumeration_cache
+
         if self.verbose:
             print("\n🔍 Enumerating virtual desktops...")
 
@@ -73,23 +325,7 @@ class MultiDesktopCapture:
                     print(f"⚠️  PowerShell script not found: {script_path}")
                 return {"error": "Script not found"}
 
-            # Find PowerShell
-            ps_paths = [
-                "powershell.exe",
-                "/mnt/c/Windows/System32/WindowsPowerShell/v1.0/powershell.exe",
-            ]
-
-            ps_exe = None
-            for path in ps_paths:
-                try:
-                    result = subprocess.run([path, "-Command", "echo test"],
-                                          capture_output=True, timeout=1)
-                    if result.returncode == 0:
-                        ps_exe = path
-                        break
-                except:
-                    continue
-
+            ps_exe = self._ps_exe
             if not ps_exe:
                 if self.verbose:
                     print("❌ PowerShell not found")
@@ -99,17 +335,19 @@ class MultiDesktopCapture:
             cmd = [ps_exe, "-NoProfile", "-ExecutionPolicy", "Bypass",
                    "-File", str(script_path)]
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+            # Keep stdout as bytes: both JSON parsers take bytes, so the
+            # payload is never decoded into a second, str copy
+            result = subprocess.run(cmd, capture_output=True, timeout=10)
 
-            if result.returncode == 0 and result.stdout.strip():
-                data = json.loads(result.stdout.strip())
+            if result.returncode == 0 and result.stdout and not result.stdout.isspace():
+                data = _json_loads(result.stdout)
                 if self.verbose:
                     print(f"✓ Found {data.get('TotalWindows', 0)} windows")
                 return data
             else:
                 if self.verbose:
-                    print(f"❌ Enumeration failed: {result.stderr}")
-                return {"error": result.stderr}
+                    print(f"❌ Enumeration failed: {result.stderr.decode(errors='replace')}")
+                return {"error": result.stderr.decode(errors='replace')}
 
         except Exception as e:
             if self.verbose:
@@ -123,15 +361,7 @@ class MultiDesktopCapture:
             result = subprocess.run(["wmctrl", "-d"], capture_output=True, text=True, timeout=2)
 
             if result.returncode == 0:
-                lines = result.stdout.strip().split("\n")
-                desktops = []
-                for line in lines:
-                    parts = line.split(None, 9)
-                    if len(parts) >= 2:
-                        desktops.append({
-                            "id": parts[0],
-                            "name": parts[-1] if len(parts) > 2 else f"Desktop {parts[0]}"
-                        })
+                desktops = _parse_wmctrl(result.stdout)
 
                 if self.verbose:
                     print(f"✓ Found {len(desktops)} virtual desktops")
@@ -139,7 +369,7 @@ class MultiDesktopCapture:
                 return {
                     "TotalDesktops": len(desktops),
                     "Desktops": desktops,
-                    "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    "Timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
                 }
         except FileNotFoundError:
             if self.verbose:
@@ -161,7 +391,7 @@ class MultiDesktopCapture:
             List of paths to captured screenshots
         """
         if session_id is None:
-            session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+            session_id = time.strftime("%Y%m%d_%H%M%S")
 
         if self.verbose:
             print(f"\n📸 Starting multi-desktop capture (session: {session_id})")
@@ -171,96 +401,103 @@ class MultiDesktopCapture:
         else:
             return self._capture_linux_all_desktops(session_id)
 
-    def _capture_windows_all_desktops(self, session_id: str) -> List[str]:
-        """Capture all Windows monitors/desktops."""
-        try:
-            script_path = Path(__file__).parent / "powershell" / "capture_all_desktops.ps1"
+    def _run_enumerate_and_capture(self) -> Optional[Dict]:
+        """
+        Enumerate and capture in one PowerShell invocation.
 
-            if not script_path.exists():
-                if self.verbose:
-                    print(f"⚠️  PowerShell script not found: {script_path}")
-                return []
+        The enumeration half is cached so a following enumerate_desktops()
+        call does not start PowerShell again.
 
-            # Find PowerShell
-            ps_paths = [
-                "powershell.exe",
-                "/mnt/c/Windows/System32/WindowsPowerShell/v1.0/powershell.exe",
-            ]
-
-            ps_exe = None
-            for path in ps_paths:
-                try:
-                    result = subprocess.run([path, "-Command", "echo test"],
-                                          capture_output=True, timeout=1)
-                    if result.returncode == 0:
-                        ps_exe = path
-                        break
-                except:
-                    continue
+        Returns:
+            Capture data as produced by capture_all_desktops.ps1 (temp
+            files), or None
+        """
+        script_path = Path(__file__).parent / "powershell" / "enumerate_and_capture.ps1"
 
-            if not ps_exe:
-                if self.verbose:
-                    print("❌ PowerShell not found")
-                return []
+        if not script_path.exists():
+            if self.verbose:
+                print(f"⚠️  PowerShell script not found: {script_path}")
+            return None
 
-            # Execute capture script
-            cmd = [ps_exe, "-NoProfile", "-ExecutionPolicy", "Bypass",
-                   "-File", str(script_path)]
+        ps_exe = self._ps_exe
+        if not ps_exe:
+            if self.verbose:
+                print("❌ PowerShell not found")
+            return None
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        # GDI+ only writes JPEG or PNG; WebP is re-encoded from PNG
+        ps_format = "jpeg" if self.image_format == "jpeg" else "png"
+        cmd = [ps_exe, "-NoProfile", "-ExecutionPolicy", "Bypass",
+               "-File", str(script_path), "-ImageFormat", ps_format]
+
+        # Bytes, not text: parsed directly without a UTF-8 decode pass
+        result = subprocess.run(cmd, capture_output=True, timeout=30)
+
+        if result.returncode != 0 or not result.stdout or result.stdout.isspace():
+            if self.verbose:
+                print(f"❌ Capture failed: {result.stderr.decode(errors='replace')}")
+            return None
 
-            if result.returncode == 0 and result.stdout.strip():
-                data = json.loads(result.stdout.strip())
+        # Both parsers accept surrounding whitespace, so skip the strip() copy
+        fused = _json_loads(result.stdout)
+        self._enumeration_cache = fused.get("Enumeration")
+        return fused.get("Capture")
 
-                saved_paths = []
-                for idx, screen in enumerate(data.get("Screens", [])):
+    def _capture_windows_all_desktops(self, session_id: str,
+                                      data: Optional[Dict] = None) -> List[str]:
+        """
+        Capture all Windows monitors/desktops.
+
+        Args:
+            session_id: Session identifier used in filenames
+            data: Pre-fetched capture data; fetched via PowerShell if None
+        """
+        try:
+            if data is None:
+                data = self._run_enumerate_and_capture()
+
+            if data:
+                screens = data.get("Screens", [])
+                filenames = []
+                for idx, screen in enumerate(screens):
                     device_name = screen.get("DeviceName", f"screen_{idx}")
                     # Clean device name for filename
-                    device_clean = device_name.replace("\\", "_").replace(".", "_")
+                    device_clean = device_name.translate(_FN_TRANS)
                     is_primary = screen.get("IsPrimary", False)
                     primary_tag = "_primary" if is_primary else ""
+                    filenames.append(f"{session_id}_desktop_{idx:02d}{primary_tag}_{device_clean}{self._ext}")
+
+                out_paths = [str(self.output_dir / name) for name in filenames]
+
+                # Encode monitors in parallel; skip pool start-up when there is
+                # a single screen or PowerShell already produced the output
+                needs_encode = any(screen.get("Format", "png") != self.image_format
+                                   or _needs_resize(screen, self.max_dimension)
+                                   for screen in screens)
+                if len(screens) > 1 and needs_encode:
+                    workers = min(len(screens), os.cpu_count() or 1)
+                    with ProcessPoolExecutor(max_workers=workers) as ex:
+                        futures = [ex.submit(_encode_one_screen, screen, path,
+                                             self.image_format, self.max_dimension)
+                                   for screen, path in zip(screens, out_paths)]
+                        saved_paths = [f.result() for f in futures]
+                else:
+                    saved_paths = [_encode_one_screen(screen, path, self.image_format, self.max_dimension)
+                                   for screen, path in zip(screens, out_paths)]
 
-                    filename = f"{session_id}_desktop_{idx:02d}{primary_tag}_{device_clean}.jpg"
-                    filepath = self.output_dir / filename
-
-                    # Decode and save base64 image
-                    img_data = base64.b64decode(screen.get("Base64Data", ""))
-
-                    # Convert PNG to JPEG with PIL
-                    try:
-                        from PIL import Image
-                        import io
-                        img = Image.open(io.BytesIO(img_data))
-                        if img.mode == 'RGBA':
-                            rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-                            rgb_img.paste(img, mask=img.split()[3])
-                            img = rgb_img
-                        img.save(str(filepath), 'JPEG', quality=85, optimize=True)
-                    except ImportError:
-                        # Fallback to PNG if PIL not available
-                        filepath = filepath.with_suffix('.png')
-                        with open(filepath, 'wb') as f:
-                            f.write(img_data)
-
-                    saved_paths.append(str(filepath))
-
-                    if self.verbose:
+                if self.verbose:
+                    for screen, filename in zip(screens, filenames):
                         bounds = screen.get("Bounds", {})
                         print(f"✓ Captured: {filename} ({bounds.get('Width')}x{bounds.get('Height')})")
-
-                if self.verbose:
                     print(f"\n✓ Total captures: {len(saved_paths)}")
 
                 return saved_paths
             else:
-                if self.verbose:
-                    print(f"❌ Capture failed: {result.stderr}")
                 return []
 
         except Exception as e:
             if self.verbose:
                 print(f"❌ Error capturing desktops: {e}")
-                import traceback
                 traceback.print_exc()
             return []
 
@@ -277,35 +514,53 @@ class MultiDesktopCapture:
                     print("❌ wmctrl failed")
                 return []
 
-            lines = result.stdout.strip().split("\n")
+            # Grab in-process with mss so encoding can overlap the next
+            # desktop's settle delay; scrot (blocking) is the fallback
+            sct = self._sct
 
-            for line in lines:
-                parts = line.split(None, 9)
-                if len(parts) >= 2:
-                    desktop_id = parts[0]
-                    desktop_name = parts[-1] if len(parts) > 2 else f"Desktop_{desktop_id}"
-                    desktop_name_clean = desktop_name.replace(" ", "_")
+            pending = []
+            with ThreadPoolExecutor(max_workers=1) as saver:
+                for desktop in _parse_wmctrl(result.stdout):
+                    desktop_id = desktop["id"]
+                    desktop_name_clean = desktop["name"].translate(_FN_TRANS)
 
                     # Switch to desktop
-                    subprocess.run(["wmctrl", "-s", desktop_id], timeout=1)
+                    subprocess.run(["wmctrl", "-s", desktop_id], timeout=1,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
                     # Small delay for desktop switch
-                    import time
                     time.sleep(0.2)
 
-                    # Capture using scrot or import
-                    filename = f"{session_id}_desktop_{desktop_id}_{desktop_name_clean}.jpg"
+                    filename = f"{session_id}_desktop_{desktop_id}_{desktop_name_clean}{self._ext}"
                     filepath = self.output_dir / filename
 
-                    # Try scrot first
+                    if sct is not None:
+                        # Grab now (must happen before switching away), save later
+                        shot = sct.grab(sct.monitors[0])
+                        future = saver.submit(_save_grab, shot, str(filepath),
+                                              self.image_format, self.max_dimension)
+                        pending.append((future, filename))
+                        continue
+
+                    # Try scrot (only the exit status matters)
                     result = subprocess.run(["scrot", "-q", "85", str(filepath)],
-                                          capture_output=True, timeout=5)
+                                          stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                          timeout=5)
 
                     if result.returncode == 0 and filepath.exists():
                         saved_paths.append(str(filepath))
                         if self.verbose:
                             print(f"✓ Captured: {filename}")
 
+                for future, filename in pending:
+                    try:
+                        saved_paths.append(future.result())
+                        if self.verbose:
+                            print(f"✓ Captured: {filename}")
+                    except Exception as e:
+                        if self.verbose:
+                            print(f"❌ Failed to save {filename}: {e}")
+
             if self.verbose:
                 print(f"\n✓ Total captures: {len(saved_paths)}")
 
@@ -326,13 +581,13 @@ def main():
     # Initialize
     capture = MultiDesktopCapture(verbose=True)
 
+    # Capture all (on WSL this also enumerates in the same PowerShell call)
+    paths = capture.capture_all_desktops()
+
     # Enumerate desktops
     desktops = capture.enumerate_desktops()
     print(f"\n📊 Desktop Info:\n{json.dumps(desktops, indent=2)}")
 
-    # Capture all
-    paths = capture.capture_all_desktops()
-
     if paths:
         print("\n" + "=" * 60)
         print("✅ Multi-desktop capture completed!")
@@ -3,7 +3,13 @@
 
 param(
     [Parameter(Mandatory=$false)]
-    [string]$OutputFormat = "base64"  # "base64" or "file"
+    [string]$OutputFormat = "base64",  # "base64" or "file"
+
+    [Parameter(Mandatory=$false)]
+    [string]$ImageFormat = "png",  # "png" or "jpeg"
+
+    [Parameter(Mandatory=$false)]
+    [int]$Quality = 85
 )
 
 Add-Type -AssemblyName System.Windows.Forms
@@ -20,6 +26,26 @@ public class User32 {
 '@
 $null = [User32]::SetProcessDPIAware()
 
+# JPEG encoder settings (GDI+ encodes directly, so Python need not re-encode)
+if ($ImageFormat -eq "jpeg") {
+    $jpegCodec = [System.Drawing.Imaging.ImageCodecInfo]::GetImageEncoders() | Where-Object { $_.MimeType -eq "image/jpeg" }
+    $encParams = New-Object System.Drawing.Imaging.EncoderParameters 1
+    $encParams.Param[0] = New-Object System.Drawing.Imaging.EncoderParameter([System.Drawing.Imaging.Encoder]::Quality, [long]$Quality)
+    $extension = ".jpg"
+}
+else {
+    $extension = ".png"
+}
+
+function Save-Bitmap($bitmap, $target) {
+    if ($ImageFormat -eq "jpeg") {
+        $bitmap.Save($target, $jpegCodec, $encParams)
+    }
+    else {
+        $bitmap.Save($target, [System.Drawing.Imaging.ImageFormat]::Png)
+    }
+}
+
 # Get all screens (monitors)
 $screens = [System.Windows.Forms.Screen]::AllScreens
 
@@ -27,9 +53,9 @@ $results = @()
 
 foreach ($screen in $screens) {
     try {
-        # Create bitmap for this screen
+        # Create bitmap for this screen (24bpp: screenshots carry no alpha)
         $bounds = $screen.Bounds
-        $bitmap = New-Object System.Drawing.Bitmap $bounds.Width, $bounds.Height
+        $bitmap = New-Object System.Drawing.Bitmap $bounds.Width, $bounds.Height, ([System.Drawing.Imaging.PixelFormat]::Format24bppRgb)
         $graphics = [System.Drawing.Graphics]::FromImage($bitmap)
 
         # Set high quality rendering
@@ -41,13 +67,7 @@ foreach ($screen in $screens) {
         # Capture from screen
         $graphics.CopyFromScreen($bounds.X, $bounds.Y, 0, 0, $bitmap.Size)
 
-        # Convert to base64
-        $stream = New-Object System.IO.MemoryStream
-        $bitmap.Save($stream, [System.Drawing.Imaging.ImageFormat]::Png)
-        $bytes = $stream.ToArray()
-        $base64 = [Convert]::ToBase64String($bytes)
-
-        $results += @{
+        $entry = @{
             DeviceName = $screen.DeviceName
             IsPrimary = $screen.Primary
             Bounds = @{
@@ -56,13 +76,28 @@ foreach ($screen in $screens) {
                 Width = $bounds.Width
                 Height = $bounds.Height
             }
-            Base64Data = $base64
+            Format = $ImageFormat
         }
 
+        if ($OutputFormat -eq "file") {
+            # Write raw image bytes to a temp file; only the path goes through JSON
+            $tmpPath = Join-Path ([System.IO.Path]::GetTempPath()) ("cammy_screen_" + [guid]::NewGuid().ToString("N") + $extension)
+            Save-Bitmap $bitmap $tmpPath
+            $entry.TempPath = $tmpPath
+        }
+        else {
+            # Convert to base64
+            $stream = New-Object System.IO.MemoryStream
+            Save-Bitmap $bitmap $stream
+            $entry.Base64Data = [Convert]::ToBase64String($stream.ToArray())
+            $stream.Dispose()
+        }
+
+        $results += $entry
+
         # Cleanup
         $graphics.Dispose()
         $bitmap.Dispose()
-        $stream.Dispose()
     }
     catch {
         Write-Error "Failed to capture screen $($screen.DeviceName): $_"
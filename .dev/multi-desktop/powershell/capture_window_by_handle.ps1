@@ -75,8 +75,8 @@ try {
     [WindowCapture]::GetWindowText($hWnd, $sb, $sb.Capacity) | Out-Null
     $windowTitle = $sb.ToString()
 
-    # Create bitmap
-    $bitmap = New-Object System.Drawing.Bitmap($width, $height)
+    # Create bitmap (24bpp: screenshots carry no alpha)
+    $bitmap = New-Object System.Drawing.Bitmap($width, $height, [System.Drawing.Imaging.PixelFormat]::Format24bppRgb)
     $graphics = [System.Drawing.Graphics]::FromImage($bitmap)
     $hdc = $graphics.GetHdc()
 
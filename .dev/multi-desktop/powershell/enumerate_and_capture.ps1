@@ -0,0 +1,16 @@
+# Enumerate windows and capture all monitors in a single PowerShell session
+# Saves one PowerShell cold start when both results are needed
+
+param(
+    [Parameter(Mandatory=$false)]
+    [string]$ImageFormat = "jpeg"  # "jpeg" or "png"
+)
+
+$enumeration = (& "$PSScriptRoot\enumerate_virtual_desktops.ps1") -join "`n"
+$capture = (& "$PSScriptRoot\capture_all_desktops.ps1" -OutputFormat file -ImageFormat $ImageFormat) -join "`n"
+
+if (-not $enumeration) { $enumeration = "null" }
+if (-not $capture) { $capture = "null" }
+
+# Splice both JSON documents without re-serializing the image payload
+"{`"Enumeration`":$enumeration,`"Capture`":$capture}"
@@ -4,15 +4,24 @@
 Test script to demonstrate monitor/desktop detection and window enumeration.
 """
 
+import io
 import sys
 import json
+import base64
 import subprocess
+import time
+import functools
 from pathlib import Path
 
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
 # Add parent to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from multi_desktop_capture import MultiDesktopCapture
+from multi_desktop_capture import MultiDesktopCapture, _find_powershell
 
 
 def parse_ps_json_output(output: str):
@@ -25,6 +34,12 @@ def parse_ps_json_output(output: str):
     raise ValueError("No JSON found in PowerShell output")
 
 
+@functools.lru_cache(maxsize=None)
+def find_ps():
+    """Locate PowerShell once and share the result across all tests."""
+    return _find_powershell()
+
+
 def test_monitor_detection():
     """Test monitor detection and counting."""
     print("\n" + "=" * 70)
@@ -37,22 +52,7 @@ def test_monitor_detection():
         print(f"❌ Script not found: {script_path}")
         return
 
-    # Find PowerShell
-    ps_paths = [
-        "powershell.exe",
-        "/mnt/c/Windows/System32/WindowsPowerShell/v1.0/powershell.exe",
-    ]
-
-    ps_exe = None
-    for path in ps_paths:
-        try:
-            result = subprocess.run([path, "-Command", "echo test"],
-                                  capture_output=True, timeout=1)
-            if result.returncode == 0:
-                ps_exe = path
-                break
-        except:
-            continue
+    ps_exe = find_ps()
 
     if not ps_exe:
         print("❌ PowerShell not found")
@@ -152,22 +152,7 @@ def test_window_capture():
         print(f"❌ Script not found: {script_path}")
         return
 
-    # Find PowerShell
-    ps_exe = None
-    ps_paths = [
-        "powershell.exe",
-        "/mnt/c/Windows/System32/WindowsPowerShell/v1.0/powershell.exe",
-    ]
-
-    for path in ps_paths:
-        try:
-            result = subprocess.run([path, "-Command", "echo test"],
-                                  capture_output=True, timeout=1)
-            if result.returncode == 0:
-                ps_exe = path
-                break
-        except:
-            continue
+    ps_exe = find_ps()
 
     if not ps_exe:
         print("❌ PowerShell not found")
@@ -196,10 +181,7 @@ def test_window_capture():
             output_dir = Path.home() / ".cache" / "sccpt" / "multi-desktop" / "tests"
             output_dir.mkdir(parents=True, exist_ok=True)
 
-            import base64
-            from datetime import datetime
-
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
             process_name = first_window.get("ProcessName", "unknown")
             filename = f"window_capture_{timestamp}_{process_name}.jpg"
             filepath = output_dir / filename
@@ -207,17 +189,14 @@ def test_window_capture():
             img_data = base64.b64decode(data.get("Base64Data"))
 
             # Convert to JPEG
-            try:
-                from PIL import Image
-                import io
+            if Image is not None:
                 img = Image.open(io.BytesIO(img_data))
                 if img.mode == 'RGBA':
-                    rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-                    rgb_img.paste(img, mask=img.split()[3])
-                    img = rgb_img
-                img.save(str(filepath), 'JPEG', quality=85, optimize=True)
+                    # Screen alpha is always opaque; drop it without a blend pass
+                    img = img.convert('RGB')
+                img.save(str(filepath), 'JPEG', quality=85)
                 print(f"   Saved to: {filepath}")
-            except ImportError:
+            else:
                 filepath = filepath.with_suffix('.png')
                 with open(filepath, 'wb') as f:
                     f.write(img_data)
@@ -239,12 +218,12 @@ def test_multi_desktop_capture():
 
     capture = MultiDesktopCapture(verbose=True)
 
-    # Enumerate
-    desktops = capture.enumerate_desktops()
-
-    # Capture all
+    # Capture all (enumerates in the same PowerShell call on WSL)
     paths = capture.capture_all_desktops()
 
+    # Enumerate (served from the capture above when available)
+    desktops = capture.enumerate_desktops()
+
     if paths:
         print(f"\n✓ Captured {len(paths)} screenshots")
         for path in paths:
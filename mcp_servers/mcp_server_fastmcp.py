@@ -7,16 +7,108 @@ Provides screenshot capture capabilities via Model Context Protocol using FastMC
 from fastmcp import FastMCP, Context
 from pathlib import Path
 import base64
+import heapq
+import io
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime
 import asyncio
 import cammy
+from cammy.utils import _detect_category
+
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    import json
+
+    def _dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"))
 
 
 mcp = FastMCP("cammy-server")
 
+# Resolved once at import; Path.home() does a user-db lookup on every call
+CACHE_DIR = Path.home() / ".cache" / "cammy"
+MONITORING_FILE = CACHE_DIR / ".monitoring"
+
+# Screenshot filenames end with the category, so a tail compare suffices
+_STDERR_SUFFIX = "-stderr.jpg"
+_STDOUT_SUFFIX = "-stdout.jpg"
+
+# clear_cache deletes in a thread pool once the cache is this large
+_PARALLEL_UNLINK_MIN = 64
+
+
+def _scan_jpgs(cache_dir) -> list:
+    """
+    List the *.jpg files in cache_dir with a single directory read.
+
+    Returns os.DirEntry objects, whose stat() result is cached, so size and
+    mtime lookups don't repeat the syscall.
+    """
+    with os.scandir(cache_dir) as it:
+        return [
+            e for e in it
+            if e.name.endswith(".jpg") and not e.name.startswith(".")
+        ]
+
+
+@lru_cache(maxsize=4096)
+def _iso(ts: float) -> str:
+    """
+    ISO-format a file mtime, memoized per timestamp.
+
+    Cached files keep their mtime, so repeated listings reuse the formatted
+    string instead of building a datetime object per file on every call.
+    """
+    return datetime.fromtimestamp(ts).isoformat()
+
+
+@lru_cache(maxsize=1024)
+def _detect_cached(path: str, mtime: float) -> str:
+    """
+    Memoize _detect_category per (path, mtime).
+
+    Detection decodes the whole image, so re-analyzing an unchanged file
+    reuses the earlier verdict; a rewritten file gets a new mtime.
+    """
+    return _detect_category(path)
+
+
+def _unlink(path: str) -> bool:
+    """Remove a file, returning whether it was actually deleted."""
+    try:
+        os.unlink(path)
+        return True
+    except OSError:
+        return False
+
+
+def _b64_file(path, chunk: int = 57 * 1024) -> str:
+    """
+    Base64-encode a file in fixed-size chunks.
+
+    The chunk size is a multiple of 3, so no padding appears mid-stream and
+    the result equals encoding the whole file at once, without holding the
+    raw file contents in memory.
+    """
+    buf = io.BytesIO()
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(chunk)
+            if not data:
+                break
+            buf.write(base64.b64encode(data))
+    return buf.getvalue().decode()
+
 
 @mcp.tool()
-def capture_screenshot(
+async def capture_screenshot(
     message: str = None,
     monitor_id: int = 0,
     capture_all: bool = False,
@@ -37,7 +129,9 @@ def capture_screenshot(
         Dictionary with success status, path, and optionally base64 data
     """
     try:
-        path = cammy.capture(
+        # JPEG encode and disk write run off the event loop
+        path = await asyncio.to_thread(
+            cammy.capture,
             message=message,
             path=None,
             quality=quality,
@@ -54,7 +148,7 @@ def capture_screenshot(
                 "error": "Failed to capture screenshot"
             }
         
-        category = "stderr" if "-stderr.jpg" in path else "stdout"
+        category = "stderr" if path.endswith(_STDERR_SUFFIX) else "stdout"
         
         result = {
             "success": True,
@@ -65,8 +159,7 @@ def capture_screenshot(
         }
         
         if return_base64 and path:
-            with open(path, "rb") as f:
-                result["base64"] = base64.b64encode(f.read()).decode()
+            result["base64"] = await asyncio.to_thread(_b64_file, path)
         
         return result
         
@@ -78,7 +171,7 @@ def capture_screenshot(
 
 
 @mcp.tool()
-def start_monitoring(
+async def start_monitoring(
     interval: float = 1.0,
     monitor_id: int = 0,
     capture_all: bool = False,
@@ -101,8 +194,8 @@ def start_monitoring(
         Dictionary with success status and monitoring details
     """
     # Check if already monitoring (simplified - FastMCP doesn't have persistent state)
-    cache_dir = Path.home() / ".cache" / "cammy"
-    monitoring_file = cache_dir / ".monitoring"
+    cache_dir = CACHE_DIR
+    monitoring_file = MONITORING_FILE
     
     if monitoring_file.exists():
         return {
@@ -111,7 +204,8 @@ def start_monitoring(
         }
     
     try:
-        monitoring_worker = cammy.start_monitor(
+        monitoring_worker = await asyncio.to_thread(
+            cammy.start_monitor,
             output_dir=output_dir or "~/.cache/cammy/",
             interval=interval,
             jpeg=True,
@@ -144,15 +238,15 @@ def start_monitoring(
 
 
 @mcp.tool()
-def stop_monitoring() -> dict:
+async def stop_monitoring() -> dict:
     """
     Stop continuous screenshot monitoring.
     
     Returns:
         Dictionary with success status and final statistics
     """
-    cache_dir = Path.home() / ".cache" / "cammy"
-    monitoring_file = cache_dir / ".monitoring"
+    cache_dir = CACHE_DIR
+    monitoring_file = MONITORING_FILE
     
     if not monitoring_file.exists():
         return {
@@ -161,13 +255,13 @@ def stop_monitoring() -> dict:
         }
     
     try:
-        cammy.stop()
+        await asyncio.to_thread(cammy.stop)
         
         # Remove monitoring marker file
         monitoring_file.unlink()
         
         # Get stats
-        screenshots = list(cache_dir.glob("*.jpg"))
+        screenshots = _scan_jpgs(cache_dir)
         
         return {
             "success": True,
@@ -189,8 +283,8 @@ def get_monitoring_status() -> dict:
     Returns:
         Dictionary with monitoring status and cache statistics
     """
-    cache_dir = Path.home() / ".cache" / "cammy"
-    monitoring_file = cache_dir / ".monitoring"
+    cache_dir = CACHE_DIR
+    monitoring_file = MONITORING_FILE
     
     status = {
         "active": monitoring_file.exists(),
@@ -199,8 +293,8 @@ def get_monitoring_status() -> dict:
     
     # Get cache size
     if cache_dir.exists():
-        screenshots = list(cache_dir.glob("*.jpg"))
-        total_size = sum(f.stat().st_size for f in screenshots)
+        screenshots = _scan_jpgs(cache_dir)
+        total_size = sum(e.stat().st_size for e in screenshots)
         status.update({
             "cache_size_mb": round(total_size / (1024 * 1024), 2),
             "screenshot_count": len(screenshots)
@@ -221,24 +315,24 @@ def analyze_screenshot(path: str) -> dict:
         Dictionary with analysis results
     """
     try:
-        from cammy.utils import _detect_category
-        
-        category = _detect_category(path)
-        
-        path_obj = Path(path)
-        if not path_obj.exists():
+        # One stat() serves the existence check, size, mtime and cache key
+        try:
+            st = Path(path).stat()
+        except FileNotFoundError:
             return {
                 "success": False,
                 "error": f"File not found: {path}"
             }
         
+        category = _detect_cached(path, st.st_mtime)
+        
         return {
             "success": True,
             "path": path,
             "category": category,
             "is_error": category == "stderr",
-            "size_kb": round(path_obj.stat().st_size / 1024, 2),
-            "modified": datetime.fromtimestamp(path_obj.stat().st_mtime).isoformat()
+            "size_kb": round(st.st_size / 1024, 2),
+            "modified": _iso(st.st_mtime)
         }
     except Exception as e:
         return {
@@ -260,7 +354,7 @@ def list_recent_screenshots(limit: int = 10, category: str = "all") -> dict:
         Dictionary with list of recent screenshots
     """
     try:
-        cache_dir = Path.home() / ".cache" / "cammy"
+        cache_dir = CACHE_DIR
         if not cache_dir.exists():
             return {
                 "success": True,
@@ -268,34 +362,35 @@ def list_recent_screenshots(limit: int = 10, category: str = "all") -> dict:
                 "message": "Cache directory does not exist"
             }
         
-        screenshots = list(cache_dir.glob("*.jpg"))
+        entries = _scan_jpgs(cache_dir)
+        screenshots = entries
         
         # Filter by category if specified
         if category == "stdout":
-            screenshots = [s for s in screenshots if "-stdout.jpg" in s.name]
+            screenshots = [s for s in screenshots if s.name.endswith(_STDOUT_SUFFIX)]
         elif category == "stderr":
-            screenshots = [s for s in screenshots if "-stderr.jpg" in s.name]
+            screenshots = [s for s in screenshots if s.name.endswith(_STDERR_SUFFIX)]
         
-        # Sort by modification time (newest first)
-        screenshots.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-        screenshots = screenshots[:limit]
+        # Newest first; only the top `limit` need ordering
+        screenshots = heapq.nlargest(limit, screenshots, key=lambda e: e.stat().st_mtime)
         
         result_list = []
         for screenshot in screenshots:
-            cat = "stderr" if "-stderr.jpg" in screenshot.name else "stdout"
+            cat = "stderr" if screenshot.name.endswith(_STDERR_SUFFIX) else "stdout"
+            st = screenshot.stat()
             result_list.append({
                 "filename": screenshot.name,
-                "path": str(screenshot),
+                "path": screenshot.path,
                 "category": cat,
-                "size_kb": round(screenshot.stat().st_size / 1024, 2),
-                "modified": datetime.fromtimestamp(screenshot.stat().st_mtime).isoformat()
+                "size_kb": round(st.st_size / 1024, 2),
+                "modified": _iso(st.st_mtime)
             })
         
         return {
             "success": True,
             "screenshots": result_list,
             "count": len(result_list),
-            "total_in_cache": len(list(cache_dir.glob("*.jpg")))
+            "total_in_cache": len(entries)
         }
     except Exception as e:
         return {
@@ -317,7 +412,7 @@ def clear_cache(max_size_gb: float = 1.0, clear_all: bool = False) -> dict:
         Dictionary with cleanup results
     """
     try:
-        cache_dir = Path.home() / ".cache" / "cammy"
+        cache_dir = CACHE_DIR
         if not cache_dir.exists():
             return {
                 "success": True,
@@ -325,13 +420,13 @@ def clear_cache(max_size_gb: float = 1.0, clear_all: bool = False) -> dict:
             }
         
         if clear_all:
-            removed = 0
-            for screenshot in cache_dir.glob("*.jpg"):
-                try:
-                    screenshot.unlink()
-                    removed += 1
-                except:
-                    pass
+            paths = [e.path for e in _scan_jpgs(cache_dir)]
+            if len(paths) > _PARALLEL_UNLINK_MIN:
+                # unlink is syscall-bound; threads overlap the kernel work
+                with ThreadPoolExecutor(max_workers=8) as pool:
+                    removed = sum(pool.map(_unlink, paths))
+            else:
+                removed = sum(map(_unlink, paths))
             
             return {
                 "success": True,
@@ -344,7 +439,7 @@ def clear_cache(max_size_gb: float = 1.0, clear_all: bool = False) -> dict:
             _manage_cache_size(cache_dir, max_size_gb)
             
             # Get new cache size
-            total_size = sum(f.stat().st_size for f in cache_dir.glob("*.jpg"))
+            total_size = sum(e.stat().st_size for e in _scan_jpgs(cache_dir))
             
             return {
                 "success": True,
@@ -481,17 +576,25 @@ def list_sessions(limit: int = 10) -> dict:
         sessions = sessions[:limit]
         
         session_details = []
-        cache_dir = Path.home() / ".cache" / "cammy"
+        cache_dir = CACHE_DIR
+        
+        # Bucket the directory by session ID in one pass instead of
+        # globbing it twice per session
+        wanted = set(sessions)
+        by_session = defaultdict(list)
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith((".jpg", ".png")):
+                    continue
+                parts = entry.name.split("_", 2)
+                if len(parts) < 3:
+                    continue
+                session_id = f"{parts[0]}_{parts[1]}"
+                if session_id in wanted:
+                    by_session[session_id].append(entry)
         
         for session_id in sessions:
-            jpg_files = list(cache_dir.glob(f"{session_id}_*.jpg"))
-            png_files = list(cache_dir.glob(f"{session_id}_*.png"))
-            
-            if not jpg_files and not png_files:
-                continue
-                
-            files = jpg_files + png_files
-            files.sort()
+            files = sorted(by_session.get(session_id, []), key=lambda e: e.name)
             
             if files:
                 first_file = files[0]
@@ -504,8 +607,8 @@ def list_sessions(limit: int = 10) -> dict:
                     "first_screenshot": first_file.name,
                     "last_screenshot": last_file.name,
                     "total_size_kb": round(total_size / 1024, 2),
-                    "start_time": datetime.fromtimestamp(first_file.stat().st_mtime).isoformat(),
-                    "end_time": datetime.fromtimestamp(last_file.stat().st_mtime).isoformat()
+                    "start_time": _iso(first_file.stat().st_mtime),
+                    "end_time": _iso(last_file.stat().st_mtime)
                 })
         
         return {
@@ -523,7 +626,7 @@ def list_sessions(limit: int = 10) -> dict:
 
 
 @mcp.resource("screenshot://{filename}")
-def get_screenshot(filename: str) -> str:
+async def get_screenshot(filename: str) -> str:
     """
     Get a screenshot from cache by filename.
     
@@ -533,16 +636,13 @@ def get_screenshot(filename: str) -> str:
     Returns:
         Base64 encoded screenshot data
     """
-    cache_dir = Path.home() / ".cache" / "cammy"
+    cache_dir = CACHE_DIR
     filepath = cache_dir / filename
     
     if not filepath.exists():
         raise ValueError(f"Screenshot not found: {filename}")
     
-    with open(filepath, "rb") as f:
-        content = base64.b64encode(f.read()).decode()
-    
-    return content
+    return await asyncio.to_thread(_b64_file, filepath)
 
 
 @mcp.resource("screenshots://recent")
@@ -556,30 +656,26 @@ def list_screenshots_resource(limit: int = 20) -> str:
     Returns:
         JSON string with screenshot metadata
     """
-    import json
-    
-    cache_dir = Path.home() / ".cache" / "cammy"
+    cache_dir = CACHE_DIR
     if not cache_dir.exists():
-        return json.dumps({"screenshots": [], "message": "Cache directory does not exist"})
+        return _dumps({"screenshots": [], "message": "Cache directory does not exist"})
     
-    screenshots = list(cache_dir.glob("*.jpg"))
-    screenshots.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-    screenshots = screenshots[:limit]
+    screenshots = heapq.nlargest(limit, _scan_jpgs(cache_dir), key=lambda e: e.stat().st_mtime)
     
     result = []
     for img_file in screenshots:
-        category = "stderr" if "-stderr.jpg" in img_file.name else "stdout"
-        mtime = datetime.fromtimestamp(img_file.stat().st_mtime)
+        category = "stderr" if img_file.name.endswith(_STDERR_SUFFIX) else "stdout"
+        st = img_file.stat()
         
         result.append({
             "filename": img_file.name,
             "category": category,
-            "size_kb": round(img_file.stat().st_size / 1024, 2),
-            "modified": mtime.isoformat(),
+            "size_kb": round(st.st_size / 1024, 2),
+            "modified": _iso(st.st_mtime),
             "uri": f"screenshot://{img_file.name}"
         })
     
-    return json.dumps({"screenshots": result, "count": len(result)})
+    return _dumps({"screenshots": result, "count": len(result)})
 
 
 if __name__ == "__main__":
@@ -7,6 +7,6 @@ set -e
 export PYTHONPATH="$PWD:$PYTHONPATH"
 
 echo "Running pytest on all tests..."
-python -m pytest tests/ -v --tb=short
+python -m pytest tests/ -v --tb=short -n auto --dist=loadfile
 
 echo "Tests completed successfully!"
\ No newline at end of file
@@ -25,6 +25,18 @@ Usage:
     cammy.start()
     # ... do work ...
     cammy.stop()
+
+Faster image encoding:
+    JPEG encoding and resizing go through PIL. The pillow-simd fork is a
+    drop-in replacement with SSE4/AVX2 code paths. Both distributions ship
+    the PIL package, so swap it in by hand after installing cammy:
+
+        pip uninstall -y Pillow && pip install --no-deps pillow-simd
+
+    cammy.USING_SIMD reports whether it is active.
+
+    Monitoring frames are JPEG-encoded with libjpeg-turbo when PyTurboJPEG
+    is installed (pip install "cammy[turbo]"), falling back to PIL.
 """
 
 from .utils import (
@@ -35,12 +47,31 @@ from .utils import (
 from .gif import (
     create_gif_from_session,
     create_gif_from_files,
+    create_gif_from_images,
     create_gif_from_pattern,
     create_gif_from_latest_session
 )
 from .session import session
 from .capture import CaptureManager
 
+def _pillow_is_simd() -> bool:
+    """Check whether PIL is provided by the pillow-simd fork."""
+    try:
+        from importlib.metadata import distribution
+        distribution("Pillow-SIMD")
+        return True
+    except Exception:
+        return False
+
+def __getattr__(name):
+    # USING_SIMD is computed on first access (PEP 562): importlib.metadata
+    # and the installed-distribution scan would otherwise dominate the cost
+    # of `import cammy` for every CLI invocation
+    if name == "USING_SIMD":
+        value = globals()[name] = _pillow_is_simd()
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # Global manager for monitor enumeration
 _manager = CaptureManager()
 
@@ -105,6 +136,7 @@ __all__ = [
     "capture_window",
     "create_gif_from_session",
     "create_gif_from_files",
+    "create_gif_from_images",
     "create_gif_from_pattern",
     "create_gif_from_latest_session"
 ]
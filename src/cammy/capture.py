@@ -15,14 +15,197 @@ Core screenshot capture functionality.
 Optimized for WSL to Windows host screen capture.
 """
 
+import base64
+import functools
+import io
+import json
+import shutil
 import subprocess
 import sys
 import threading
 import time
+import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+# PowerShell locations tried in order; the first is resolved through PATH
+_PS_CANDIDATES = (
+    "powershell.exe",
+    "/mnt/c/Windows/System32/WindowsPowerShell/v1.0/powershell.exe",
+    "/mnt/c/Windows/SysWOW64/WindowsPowerShell/v1.0/powershell.exe",
+)
+
+
+# Line capture_server.ps1 writes after each response
+_PS_SENTINEL = "---EOF---"
+
+# Frames waiting to be encoded before the oldest queued one is dropped
+_ENCODE_BACKLOG = 4
+
+
+@functools.lru_cache(maxsize=1)
+def _find_powershell() -> Optional[str]:
+    """
+    Locate the PowerShell executable once per process.
+
+    Uses PATH lookup and file-existence checks instead of launching a test
+    process, which costs a full WSL-to-Windows process start per probe.
+
+    Returns
+    -------
+    str or None
+        Path to powershell.exe, or None if it is not reachable
+    """
+    for path in _PS_CANDIDATES:
+        if os.sep in path:
+            if os.path.exists(path):
+                return path
+        else:
+            found = shutil.which(path)
+            if found:
+                return found
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _native_fallback() -> Optional[str]:
+    """
+    Pick the screen grabber used when mss is not installed, once per process.
+
+    Returns
+    -------
+    str or None
+        "pil" (in-process PIL.ImageGrab on X11), "grim" (Wayland),
+        "scrot", or None if nothing usable is available
+    """
+    if os.environ.get("DISPLAY"):
+        try:
+            from PIL import Image, ImageGrab  # noqa: F401
+
+            if getattr(Image.core, "HAVE_XCB", False):
+                return "pil"
+        except ImportError:
+            pass
+    if os.environ.get("WAYLAND_DISPLAY") and shutil.which("grim"):
+        return "grim"
+    if shutil.which("scrot"):
+        return "scrot"
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _running_in_wsl() -> bool:
+    """Check once per process whether we are running under WSL."""
+    return sys.platform == "linux" and "microsoft" in os.uname().release.lower()
+
+
+# (epoch second, formatted prefix) of the last timestamp, so strftime runs
+# at most once per second however fast frames are taken
+_timestamp_cache = (None, "")
+
+
+def _ms_timestamp() -> str:
+    """
+    Current local time as ``YYYYmmdd_HHMMSS_mmm`` for screenshot filenames.
+
+    Same text as ``datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]``
+    without building a datetime per frame.
+    """
+    global _timestamp_cache
+    sec, ms = divmod(time.time_ns() // 1_000_000, 1000)
+    cached_sec, prefix = _timestamp_cache
+    if cached_sec != sec:
+        prefix = time.strftime("%Y%m%d_%H%M%S", time.localtime(sec))
+        _timestamp_cache = (sec, prefix)
+    return f"{prefix}_{ms:03d}"
+
+
+def _flatten_alpha(img):
+    """
+    Convert an RGBA PIL image to RGB over a white background for JPEG.
+
+    Screen captures are almost always fully opaque; then the alpha band is
+    simply dropped, skipping the four-band split and masked paste.
+    """
+    if img.mode != "RGBA":
+        return img
+    if img.getchannel("A").getextrema() == (255, 255):
+        return img.convert("RGB")
+
+    from PIL import Image
+
+    # One-pass composite over white instead of a masked paste
+    background = Image.new("RGBA", img.size, (255, 255, 255, 255))
+    return Image.alpha_composite(background, img).convert("RGB")
+
+
+# File extension for each ScreenshotWorker image_format
+_EXTENSIONS = {"jpeg": "jpg", "png": "png", "jxl": "jxl"}
+
+
+def _save_jxl(img, filepath: Path, quality: int):
+    """
+    Save a PIL image as JPEG XL via pillow-jxl-plugin.
+
+    Uses the fastest encoder effort; at screen-capture sizes this encodes
+    several times faster than PIL's JPEG at comparable quality.
+    """
+    import pillow_jxl  # noqa: F401  (registers the JXL format with PIL)
+
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGB")
+    img.save(str(filepath), "JXL", quality=quality, effort=1)
+
+
+# Shared libjpeg-turbo encoder; False once PyTurboJPEG is known to be missing
+_jpeg_encoder = None
+
+
+def _get_jpeg_encoder():
+    """Return a TurboJPEG encoder, or None if PyTurboJPEG is unavailable."""
+    global _jpeg_encoder
+    if _jpeg_encoder is None:
+        try:
+            import numpy  # noqa: F401  (TurboJPEG.encode takes ndarrays)
+            from turbojpeg import TurboJPEG
+
+            _jpeg_encoder = TurboJPEG()
+        except Exception:
+            _jpeg_encoder = False
+    return _jpeg_encoder or None
+
+
+@functools.lru_cache(maxsize=32)
+def _windows_dir(directory: str) -> Optional[str]:
+    """
+    Translate a WSL directory to its Windows path with ``wslpath -w``.
+
+    Cached per directory, so a monitoring session pays for the lookup once
+    rather than on every frame.
+
+    Returns
+    -------
+    str or None
+        Windows path (e.g. ``\\\\wsl.localhost\\Ubuntu\\...``), or None if
+        wslpath is unavailable or fails
+    """
+    try:
+        result = subprocess.run(
+            ["wslpath", "-w", directory],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except Exception:
+        return None
+    win_dir = result.stdout.strip()
+    if result.returncode != 0 or not win_dir:
+        return None
+    return win_dir
+
 
 class ScreenshotWorker:
     """
@@ -39,6 +222,7 @@ class ScreenshotWorker:
         jpeg_quality: int = 60,
         on_capture=None,
         on_error=None,
+        image_format: Optional[str] = None,
     ):
         """
         Initialize screenshot worker.
@@ -59,11 +243,20 @@ class ScreenshotWorker:
             Callback function called with filepath after each capture
         on_error : callable, optional
             Callback function called with exception on errors
+        image_format : str, optional
+            "jpeg", "png" or "jxl" (JPEG XL, needs pillow-jxl-plugin);
+            overrides use_jpeg. jpeg_quality also sets the JPEG XL quality.
         """
+        if image_format is None:
+            image_format = "jpeg" if use_jpeg else "png"
+        if image_format not in _EXTENSIONS:
+            raise ValueError(f"Unsupported image_format: {image_format}")
+
         self.output_dir = Path(output_dir)
         self.interval_sec = interval_sec
         self.verbose = verbose
-        self.use_jpeg = use_jpeg
+        self.image_format = image_format
+        self.use_jpeg = image_format == "jpeg"
         self.jpeg_quality = jpeg_quality
         self.on_capture = on_capture
         self.on_error = on_error
@@ -71,16 +264,45 @@ class ScreenshotWorker:
         # Worker state
         self.running = False
         self.worker_thread = None
+        self._stop_event = threading.Event()
         self.screenshot_count = 0
+        # Frames counted in screenshot_count but dropped before being
+        # written because the encoder fell behind
+        self.dropped_count = 0
         self.session_id = None
 
         # Monitor capture settings
         self.monitor = 0  # Default to primary monitor (0-based indexing)
         self.capture_all = False  # Default to single monitor
 
+        # Long-lived PowerShell capture process (WSL monitoring only)
+        self._ps_server = None
+        self._use_ps_server = False
+
+        # Encoder threads for monitoring sessions; captures taken outside
+        # start()/stop() are encoded inline
+        self._encode_pool = None
+        self._encode_pending = deque()
+        self._frame_future = None
+
+        # mss grabber reused by the worker thread for the whole session
+        self._sct = None
+
         # Create output directory
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        # Windows drives are mounted over DrvFs, where every create/stat
+        # from WSL is far slower than on the Linux filesystem
+        if self._is_wsl() and os.path.abspath(str(self.output_dir)).startswith(
+            "/mnt/"
+        ):
+            warnings.warn(
+                f"Screenshot directory {self.output_dir} is on a Windows "
+                "drive mount (DrvFs); file operations there are much slower "
+                "than under the WSL filesystem (e.g. ~/.cache/cammy)",
+                stacklevel=2,
+            )
+
     def start(self, session_id: str = None):
         """Start the screenshot worker thread."""
         if self.running:
@@ -89,7 +311,17 @@ class ScreenshotWorker:
             return
 
         self.running = True
+        self._stop_event.clear()
         self.screenshot_count = 0
+        self.dropped_count = 0
+        # Keep one PowerShell process for the whole session instead of
+        # paying its startup on every frame
+        self._use_ps_server = self._is_wsl()
+        # Encode and write frames off the capture thread so the next
+        # capture is not held up by JPEG compression
+        self._encode_pool = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="cammy-enc"
+        )
         self.session_id = session_id or datetime.now().strftime(
             "%Y%m%d_%H%M%S"
         )
@@ -101,7 +333,7 @@ class ScreenshotWorker:
         self.worker_thread.start()
 
         if self.verbose:
-            ext = "jpg" if self.use_jpeg else "png"
+            ext = _EXTENSIONS[self.image_format]
             print(
                 f"📸 Started: {self.output_dir}/{self.session_id}_NNNN_*.{ext} (interval: {self.interval_sec}s)"
             )
@@ -112,13 +344,26 @@ class ScreenshotWorker:
             return
 
         self.running = False
+        self._stop_event.set()  # Wake the worker out of its interval wait
 
         if self.worker_thread and self.worker_thread.is_alive():
             self.worker_thread.join(timeout=2)
 
+        self._close_ps_server()
+
+        # Flush frames still being encoded
+        pool, self._encode_pool = self._encode_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+        self._encode_pending.clear()
+
         if self.verbose:
+            saved = self.screenshot_count - self.dropped_count
+            dropped = (
+                f" ({self.dropped_count} dropped)" if self.dropped_count else ""
+            )
             print(
-                f"📸 Stopped: {self.screenshot_count} screenshots in {self.output_dir}"
+                f"📸 Stopped: {saved} screenshots{dropped} in {self.output_dir}"
             )
 
     def _worker_loop(self):
@@ -126,67 +371,144 @@ class ScreenshotWorker:
 
         next_capture_time = time.time()
 
-        while self.running:
+        while not self._stop_event.is_set():
             current_time = time.time()
 
             # Check if it's time for next capture
             if current_time >= next_capture_time:
                 try:
+                    self._frame_future = None
                     screenshot_path = self._take_screenshot()
 
                     if screenshot_path:
-                        if self.verbose:
-                            # Simple one-line output
-                            print(f"📸 {screenshot_path}")
-
-                        # Call on_capture callback if provided
-                        if self.on_capture:
-                            try:
-                                self.on_capture(screenshot_path)
-                            except Exception as cb_error:
-                                if self.verbose:
-                                    print(f"⚠️ Callback error: {cb_error}")
+                        future, self._frame_future = self._frame_future, None
+                        if future is None:
+                            self._notify_capture(screenshot_path)
+                        else:
+                            # Report the frame once its file is written
+                            future.add_done_callback(
+                                lambda f, path=screenshot_path: self._frame_done(
+                                    f, path
+                                )
+                            )
 
                 except Exception as e:
-                    if self.verbose:
-                        print(f"❌ Error: {e}")
-
-                    # Call on_error callback if provided
-                    if self.on_error:
-                        try:
-                            self.on_error(e)
-                        except Exception as cb_error:
-                            if self.verbose:
-                                print(f"⚠️ Error callback failed: {cb_error}")
+                    self._notify_error(e)
 
                 # Schedule next capture
                 next_capture_time = current_time + self.interval_sec
 
-            # Short sleep to avoid busy waiting, but allow responsive stopping
-            time.sleep(0.01)
+            # Sleep until the next capture is due; stop() sets the event
+            # and ends the wait immediately
+            self._stop_event.wait(
+                timeout=max(0.0, next_capture_time - time.time())
+            )
+
+        # mss handles belong to the thread that opened them
+        self._close_sct()
+
+    def _close_sct(self):
+        """Release the cached mss grabber, if any."""
+        sct, self._sct = self._sct, None
+        if sct is not None:
+            try:
+                sct.close()
+            except Exception:
+                pass
+
+    def _notify_capture(self, screenshot_path: str):
+        """Report a saved frame to the log and the on_capture callback."""
+        if self.verbose:
+            # Simple one-line output
+            print(f"📸 {screenshot_path}")
+
+        # Call on_capture callback if provided
+        if self.on_capture:
+            try:
+                self.on_capture(screenshot_path)
+            except Exception as cb_error:
+                if self.verbose:
+                    print(f"⚠️ Callback error: {cb_error}")
+
+    def _notify_error(self, e: Exception):
+        """Report a capture error to the log and the on_error callback."""
+        if self.verbose:
+            print(f"❌ Error: {e}")
+
+        # Call on_error callback if provided
+        if self.on_error:
+            try:
+                self.on_error(e)
+            except Exception as cb_error:
+                if self.verbose:
+                    print(f"⚠️ Error callback failed: {cb_error}")
+
+    def _frame_done(self, future, screenshot_path: str):
+        """Encoder-thread completion hook for a deferred frame."""
+        if future.cancelled():
+            # Dropped because the encoder fell behind; its number is left
+            # as a gap in the filename sequence
+            self.dropped_count += 1
+            self._notify_error(
+                RuntimeError(
+                    f"Dropped frame {screenshot_path}: encoder fell behind"
+                )
+            )
+            return
+        error = future.exception()
+        if error is not None:
+            self._notify_error(error)
+        else:
+            self._notify_capture(screenshot_path)
+
+    def _encode(self, fn, *args) -> bool:
+        """
+        Run an encode-and-write job, on the encoder pool when monitoring.
+
+        Parameters
+        ----------
+        fn : callable
+            Job that encodes the frame and writes it to disk
+        *args
+            Arguments for fn
+
+        Returns
+        -------
+        bool
+            True if the job was queued, False if it ran inline
+        """
+        pool = self._encode_pool
+        if pool is None:
+            fn(*args)
+            return False
+
+        # Bound the backlog: drop the oldest frame no encoder has picked up
+        # yet, or wait for the oldest if every one is already running
+        pending = self._encode_pending
+        while pending and pending[0].done():
+            pending.popleft()
+        if len(pending) >= _ENCODE_BACKLOG:
+            for future in pending:
+                if future.cancel():
+                    pending.remove(future)
+                    break
+            else:
+                wait([pending.popleft()])
+
+        self._frame_future = pool.submit(fn, *args)
+        pending.append(self._frame_future)
+        return True
 
     def _take_screenshot(self) -> Optional[str]:
         """Take a single screenshot."""
         try:
             # Generate filename with timestamp
-            now = datetime.now()
-            timestamp = now.strftime("%Y%m%d_%H%M%S_%f")[:-3]
-            ext = "jpg" if self.use_jpeg else "png"
+            timestamp = _ms_timestamp()
+            ext = _EXTENSIONS[self.image_format]
             filename = f"{self.session_id}_{self.screenshot_count:04d}_{timestamp}.{ext}"
             filepath = self.output_dir / filename
 
-            # Try Windows PowerShell method for WSL
-            if self._is_wsl():
-                if self._capture_windows_screen(
-                    filepath,
-                    monitor=self.monitor,
-                    capture_all=self.capture_all,
-                ):
-                    self.screenshot_count += 1
-                    return str(filepath)
-
-            # Fallback to native screenshot tools
-            if self._capture_native_screen(filepath):
+            if self._capture_to(filepath):
                 self.screenshot_count += 1
                 return str(filepath)
 
@@ -197,12 +519,23 @@ class ScreenshotWorker:
                 print(f"❌ Screenshot failed: {e}")
             return None
 
+    def _capture_to(self, filepath: Path) -> bool:
+        """Capture one frame into filepath."""
+        # Try Windows PowerShell method for WSL
+        if self._is_wsl():
+            if self._capture_windows_screen(
+                filepath,
+                monitor=self.monitor,
+                capture_all=self.capture_all,
+            ):
+                return True
+
+        # Fallback to native screenshot tools
+        return self._capture_native_screen(filepath)
+
     def _is_wsl(self) -> bool:
-        """Check if running in WSL."""
-        return (
-            sys.platform == "linux"
-            and "microsoft" in os.uname().release.lower()
-        )
+        """Check if running in WSL (cached for the process)."""
+        return _running_in_wsl()
 
     def _capture_windows_screen(
         self, filepath: Path, monitor: int = 1, capture_all: bool = False
@@ -215,6 +548,24 @@ class ScreenshotWorker:
             capture_all: If True, capture all monitors combined
         """
         try:
+            # Let PowerShell encode straight into the output file when the
+            # directory is reachable from Windows, skipping the base64
+            # round-trip through stdout and the re-encode here
+            image_format = "jpeg" if self.use_jpeg else "png"
+            win_path = self._windows_path(filepath)
+
+            # Persistent capture process first (monitoring sessions)
+            if self._use_ps_server:
+                data = self._ps_server_capture(
+                    monitor, capture_all, win_path, image_format
+                )
+                if data == "OK":
+                    return filepath.exists()
+                if data:
+                    if self._save_png_data(filepath, base64.b64decode(data)):
+                        return True
+                    return filepath.exists()
+
             # Try using external PowerShell script first
             script_dir = Path(__file__).parent / "powershell"
             if capture_all:
@@ -225,26 +576,7 @@ class ScreenshotWorker:
             # Check if script exists
             if script_path.exists():
 
-                # Find PowerShell executable
-                ps_paths = [
-                    "powershell.exe",
-                    "/mnt/c/Windows/System32/WindowsPowerShell/v1.0/powershell.exe",
-                    "/mnt/c/Windows/SysWOW64/WindowsPowerShell/v1.0/powershell.exe",
-                ]
-
-                ps_exe = None
-                for path in ps_paths:
-                    try:
-                        test_result = subprocess.run(
-                            [path, "-Command", "echo test"],
-                            capture_output=True,
-                            timeout=1,
-                        )
-                        if test_result.returncode == 0:
-                            ps_exe = path
-                            break
-                    except:
-                        continue
+                ps_exe = _find_powershell()
 
                 if ps_exe:
                     # Build PowerShell command
@@ -256,8 +588,6 @@ class ScreenshotWorker:
                             "Bypass",
                             "-File",
                             str(script_path),
-                            "-OutputFormat",
-                            "base64",
                         ]
                     else:
                         # Pass 0-based monitor index directly to PowerShell
@@ -270,52 +600,55 @@ class ScreenshotWorker:
                             str(script_path),
                             "-MonitorNumber",
                             str(monitor),
-                            "-OutputFormat",
-                            "base64",
                         ]
-
-                    result = subprocess.run(
-                        cmd, capture_output=True, text=True, timeout=5
-                    )
-
-                    if result.returncode == 0 and result.stdout.strip():
-                        # Decode base64 PNG data
-                        import base64
-
-                        png_data = base64.b64decode(result.stdout.strip())
-
-                        # Save directly as JPEG if requested, otherwise as PNG
-                        if self.use_jpeg:
-                            try:
-                                import io
-
-                                from PIL import Image
-
-                                img = Image.open(io.BytesIO(png_data))
-                                # Convert RGBA to RGB for JPEG
-                                if img.mode == "RGBA":
-                                    rgb_img = Image.new(
-                                        "RGB", img.size, (255, 255, 255)
-                                    )
-                                    rgb_img.paste(
-                                        img, mask=img.split()[3]
-                                    )  # Use alpha channel as mask
-                                    img = rgb_img
-                                img.save(
-                                    str(filepath),
-                                    "JPEG",
-                                    quality=self.jpeg_quality,
-                                    optimize=True,
+                    if win_path:
+                        cmd += [
+                            "-OutputPath",
+                            win_path,
+                            "-ImageFormat",
+                            image_format,
+                            "-Quality",
+                            str(self.jpeg_quality),
+                        ]
+                        result = subprocess.run(
+                            cmd, capture_output=True, text=True, timeout=5
+                        )
+                        if (
+                            result.returncode == 0
+                            and result.stdout.strip() == "OK"
+                        ):
+                            return filepath.exists()
+
+                    elif self.image_format == "png":
+                        # Stream the raw PNG bytes from PowerShell straight
+                        # into the output file
+                        cmd += ["-OutputFormat", "raw"]
+                        try:
+                            with open(str(filepath), "wb") as out:
+                                result = subprocess.run(
+                                    cmd,
+                                    stdout=out,
+                                    stderr=subprocess.DEVNULL,
+                                    timeout=5,
                                 )
-                            except ImportError:
-                                # PIL not available, save as PNG
-                                with open(str(filepath), "wb") as f:
-                                    f.write(png_data)
-                        else:
-                            with open(str(filepath), "wb") as f:
-                                f.write(png_data)
+                        except subprocess.TimeoutExpired:
+                            result = None
+                        if result and result.returncode == 0:
+                            if filepath.stat().st_size > 0:
+                                return True
+                        filepath.unlink()
 
-                        return filepath.exists()
+                    else:
+                        # Raw PNG bytes (no base64) to re-encode here
+                        cmd += ["-OutputFormat", "raw"]
+                        result = subprocess.run(
+                            cmd, capture_output=True, timeout=5
+                        )
+                        if result.returncode == 0 and result.stdout:
+                            if self._save_png_data(filepath, result.stdout):
+                                return True
+
+                            return filepath.exists()
 
             # Fallback to inline script
             return self._capture_windows_screen_inline(filepath)
@@ -328,6 +661,167 @@ class ScreenshotWorker:
                 traceback.print_exc()
         return False
 
+    def _windows_path(self, filepath: Path) -> Optional[str]:
+        """Windows path PowerShell can save filepath to, or None."""
+        if self.image_format == "jxl":
+            # GDI+ has no JPEG XL encoder; those frames are encoded here
+            return None
+        win_dir = _windows_dir(os.path.abspath(str(filepath.parent)))
+        if win_dir is None:
+            return None
+        return win_dir.rstrip("\\") + "\\" + filepath.name
+
+    def _ps_server_capture(
+        self,
+        monitor: int = 0,
+        capture_all: bool = False,
+        win_path: Optional[str] = None,
+        image_format: str = "png",
+    ) -> Optional[str]:
+        """
+        Request one capture from the persistent PowerShell process.
+
+        Parameters
+        ----------
+        monitor : int
+            Monitor index (0-based)
+        capture_all : bool
+            Capture the whole virtual screen instead of one monitor
+        win_path : str, optional
+            Windows path to save the image to directly
+        image_format : str
+            "png" or "jpeg"; only used with win_path
+
+        Returns
+        -------
+        str or None
+            "OK" once the image is written to win_path, base64 PNG data
+            when no win_path was given, or None if the process is
+            unavailable or the capture failed (the caller then falls back
+            to a one-shot script)
+        """
+        proc = self._ps_server
+        if proc is None or proc.poll() is not None:
+            proc = self._ps_server = self._start_ps_server()
+            if proc is None:
+                return None
+
+        # A hung capture kills the process, which unblocks readline() below
+        watchdog = threading.Timer(10, proc.kill)
+        watchdog.start()
+        try:
+            request = "all" if capture_all else str(monitor)
+            if win_path:
+                request = "\t".join(
+                    (request, win_path, image_format, str(self.jpeg_quality))
+                )
+            proc.stdin.write(request + "\n")
+            proc.stdin.flush()
+
+            data = ""
+            while True:
+                line = proc.stdout.readline()
+                if not line:
+                    raise EOFError("PowerShell capture process exited")
+                line = line.strip()
+                if line == _PS_SENTINEL:
+                    break
+                data = line
+
+            return data or None
+
+        except Exception as e:
+            if self.verbose:
+                print(f"⚠️ PowerShell capture process failed: {e}")
+            self._close_ps_server()
+            self._use_ps_server = False
+            return None
+        finally:
+            watchdog.cancel()
+
+    def _start_ps_server(self):
+        """Launch the persistent PowerShell capture loop, or return None."""
+        script_path = Path(__file__).parent / "powershell" / "capture_server.ps1"
+        ps_exe = _find_powershell()
+        if not ps_exe or not script_path.exists():
+            return None
+        try:
+            return subprocess.Popen(
+                [
+                    ps_exe,
+                    "-NoProfile",
+                    "-ExecutionPolicy",
+                    "Bypass",
+                    "-File",
+                    str(script_path),
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        except Exception:
+            return None
+
+    def _close_ps_server(self):
+        """Shut down the persistent PowerShell process, if any."""
+        proc, self._ps_server = self._ps_server, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=2)
+        except Exception:
+            proc.kill()
+
+    def _save_png_data(self, filepath: Path, png_data: bytes) -> bool:
+        """Save captured PNG bytes; True if deferred to the encoder pool."""
+        return self._encode(self._write_png_data, filepath, png_data)
+
+    def _write_png_data(self, filepath: Path, png_data: bytes):
+        """Write captured PNG bytes, re-encoding as JPEG if requested."""
+        if self.image_format == "jxl":
+            from PIL import Image
+
+            _save_jxl(
+                Image.open(io.BytesIO(png_data)), filepath, self.jpeg_quality
+            )
+            return
+        if self.use_jpeg:
+            try:
+                from PIL import Image
+
+                img = Image.open(io.BytesIO(png_data))
+                # Convert RGBA to RGB for JPEG
+                img = _flatten_alpha(img)
+                tj = _get_jpeg_encoder()
+                if tj:
+                    import numpy as np
+                    from turbojpeg import TJPF_RGB
+
+                    if img.mode != "RGB":
+                        img = img.convert("RGB")
+                    filepath.write_bytes(
+                        tj.encode(
+                            np.asarray(img),
+                            quality=self.jpeg_quality,
+                            pixel_format=TJPF_RGB,
+                        )
+                    )
+                    return
+                img.save(
+                    str(filepath),
+                    "JPEG",
+                    quality=self.jpeg_quality,
+                    optimize=True,
+                )
+                return
+            except ImportError:
+                # PIL not available, save as PNG
+                pass
+        with open(str(filepath), "wb") as f:
+            f.write(png_data)
+
     def _capture_windows_screen_inline(self, filepath: Path) -> bool:
         """Fallback inline PowerShell capture (when .ps1 files not available)."""
         try:
@@ -361,7 +855,35 @@ class ScreenshotWorker:
             $graphics.PixelOffsetMode = [System.Drawing.Drawing2D.PixelOffsetMode]::HighQuality
 
             $graphics.CopyFromScreen($screen.Bounds.X, $screen.Bounds.Y, 0, 0, $bitmap.Size)
+            """
+
+            # Save in the final format straight into the output file when
+            # Windows can reach it, instead of PNG -> base64 -> PIL -> JPEG
+            win_path = self._windows_path(filepath)
+            if win_path and self.use_jpeg:
+                ps_script += """
+            $jpegCodec = [System.Drawing.Imaging.ImageCodecInfo]::GetImageEncoders() | Where-Object { $_.MimeType -eq 'image/jpeg' }
+            $params = New-Object System.Drawing.Imaging.EncoderParameters 1
+            $params.Param[0] = New-Object System.Drawing.Imaging.EncoderParameter([System.Drawing.Imaging.Encoder]::Quality, [long]%d)
+            $bitmap.Save('%s', $jpegCodec, $params)
+            'OK'
+
+            $graphics.Dispose()
+            $bitmap.Dispose()
+            """ % (
+                    self.jpeg_quality,
+                    win_path.replace("'", "''"),
+                )
+            elif win_path:
+                ps_script += """
+            $bitmap.Save('%s', [System.Drawing.Imaging.ImageFormat]::Png)
+            'OK'
 
+            $graphics.Dispose()
+            $bitmap.Dispose()
+            """ % win_path.replace("'", "''")
+            else:
+                ps_script += """
             $stream = New-Object System.IO.MemoryStream
             $bitmap.Save($stream, [System.Drawing.Imaging.ImageFormat]::Png)
             $bytes = $stream.ToArray()
@@ -372,38 +894,7 @@ class ScreenshotWorker:
             $stream.Dispose()
             """
 
-            # Find PowerShell executable
-            ps_paths = [
-                # Check PATH first (might be in .win-bin or similar)
-                "powershell.exe",
-                # Standard WSL path
-                "/mnt/c/Windows/System32/WindowsPowerShell/v1.0/powershell.exe",
-                # Alternative locations
-                "/mnt/c/Windows/SysWOW64/WindowsPowerShell/v1.0/powershell.exe",
-            ]
-
-            ps_exe = None
-            for path in ps_paths:
-                try:
-                    # Just check if the file exists and is executable
-                    test_path = (
-                        Path(path)
-                        if not path.startswith("/mnt/")
-                        else Path(path)
-                    )
-                    if path == "powershell.exe":
-                        # In PATH - use it directly
-                        ps_exe = path
-                        if self.verbose:
-                            print(f"✓ Found PowerShell in PATH")
-                        break
-                    elif test_path.exists() or Path(path).exists():
-                        ps_exe = path
-                        if self.verbose:
-                            print(f"✓ Found PowerShell at {path}")
-                        break
-                except:
-                    continue
+            ps_exe = _find_powershell()
 
             if not ps_exe:
                 if self.verbose:
@@ -437,43 +928,14 @@ class ScreenshotWorker:
                     print(f"❌ PowerShell timeout after 10s")
                 return False
 
+            if result.returncode == 0 and win_path:
+                return result.stdout.strip() == "OK" and filepath.exists()
+
             if result.returncode == 0 and result.stdout.strip():
                 # Decode base64 PNG data
-                import base64
-
                 png_data = base64.b64decode(result.stdout.strip())
-
-                # Save directly as JPEG if requested, otherwise as PNG
-                if self.use_jpeg:
-                    try:
-                        import io
-
-                        from PIL import Image
-
-                        # Load PNG from memory
-                        img = Image.open(io.BytesIO(png_data))
-                        # Convert RGBA to RGB for JPEG
-                        if img.mode == "RGBA":
-                            rgb_img = Image.new(
-                                "RGB", img.size, (255, 255, 255)
-                            )
-                            rgb_img.paste(img, mask=img.split()[3])
-                            img = rgb_img
-                        # Save as JPEG with quality
-                        img.save(
-                            str(filepath),
-                            "JPEG",
-                            quality=self.jpeg_quality,
-                            optimize=True,
-                        )
-                    except ImportError:
-                        # PIL not available, save as PNG
-                        with open(str(filepath), "wb") as f:
-                            f.write(png_data)
-                else:
-                    # Save as PNG
-                    with open(str(filepath), "wb") as f:
-                        f.write(png_data)
+                if self._save_png_data(filepath, png_data):
+                    return True
 
                 return filepath.exists()
         except Exception:
@@ -487,7 +949,15 @@ class ScreenshotWorker:
             try:
                 import mss
 
-                with mss.mss() as sct:
+                # Keep one grabber (display connection, monitor list and
+                # capture buffers) for a monitoring session rather than
+                # opening a new one per frame
+                sct = self._sct
+                if sct is None:
+                    sct = mss.mss()
+                    if self.running:
+                        self._sct = sct
+                try:
                     # Capture primary monitor
                     monitor = (
                         sct.monitors[1]
@@ -495,43 +965,62 @@ class ScreenshotWorker:
                         else sct.monitors[0]
                     )
                     screenshot = sct.grab(monitor)
-
-                    if self.use_jpeg:
-                        # Convert to PIL for JPEG saving
-                        from PIL import Image
-
-                        img = Image.frombytes(
-                            "RGB",
-                            screenshot.size,
-                            screenshot.bgra,
-                            "raw",
-                            "BGRX",
-                        )
-                        img.save(
-                            str(filepath), "JPEG", quality=self.jpeg_quality
-                        )
-                    else:
-                        mss.tools.to_png(
-                            screenshot.rgb,
-                            screenshot.size,
-                            output=str(filepath),
-                        )
-
-                    return filepath.exists()
+                except Exception:
+                    # Reconnect on the next frame
+                    self._sct = None
+                    raise
+                finally:
+                    if sct is not self._sct:
+                        sct.close()
+
+                if self._encode(self._write_mss_frame, filepath, screenshot):
+                    return True
+                return filepath.exists()
             except ImportError:
                 pass
 
-            # Try scrot
-            if self.use_jpeg:
-                cmd = [
-                    "scrot",
-                    "-z",
-                    "-q",
-                    str(self.jpeg_quality),
-                    str(filepath),
-                ]
+            # Fallback grabber, resolved once per process
+            fallback = _native_fallback()
+            if fallback == "pil":
+                # In-process X11 grab; no fork/exec per frame
+                from PIL import ImageGrab
+
+                img = ImageGrab.grab()
+                if self.image_format == "jxl":
+                    _save_jxl(img, filepath, self.jpeg_quality)
+                elif self.use_jpeg:
+                    img.convert("RGB").save(
+                        str(filepath), "JPEG", quality=self.jpeg_quality
+                    )
+                else:
+                    img.save(str(filepath), "PNG")
+                return filepath.exists()
+
+            if fallback == "grim":
+                if self.use_jpeg:
+                    cmd = [
+                        "grim",
+                        "-t",
+                        "jpeg",
+                        "-q",
+                        str(self.jpeg_quality),
+                        str(filepath),
+                    ]
+                else:
+                    cmd = ["grim", str(filepath)]
+            elif fallback == "scrot":
+                if self.use_jpeg:
+                    cmd = [
+                        "scrot",
+                        "-z",
+                        "-q",
+                        str(self.jpeg_quality),
+                        str(filepath),
+                    ]
+                else:
+                    cmd = ["scrot", "-z", str(filepath)]
             else:
-                cmd = ["scrot", "-z", str(filepath)]
+                return False
 
             result = subprocess.run(cmd, capture_output=True, timeout=2)
             return result.returncode == 0 and filepath.exists()
@@ -541,12 +1030,61 @@ class ScreenshotWorker:
                 print(f"❌ Native screen capture failed: {e}")
         return False
 
+    def _write_mss_frame(self, filepath: Path, screenshot):
+        """Encode an mss screenshot as JPEG, PNG or JPEG XL and write it."""
+        tj = _get_jpeg_encoder() if self.use_jpeg else None
+        if self.image_format == "jxl":
+            from PIL import Image
+
+            img = Image.frombytes(
+                "RGB", screenshot.size, screenshot.bgra, "raw", "BGRX"
+            )
+            _save_jxl(img, filepath, self.jpeg_quality)
+        elif tj:
+            # Encode the raw BGRA buffer directly with
+            # libjpeg-turbo, skipping the PIL image
+            import numpy as np
+            from turbojpeg import TJPF_BGRX
+
+            width, height = screenshot.size
+            frame = np.frombuffer(screenshot.bgra, np.uint8).reshape(
+                height, width, 4
+            )
+            filepath.write_bytes(
+                tj.encode(
+                    frame,
+                    quality=self.jpeg_quality,
+                    pixel_format=TJPF_BGRX,
+                )
+            )
+        elif self.use_jpeg:
+            # Convert to PIL for JPEG saving
+            from PIL import Image
+
+            img = Image.frombytes(
+                "RGB",
+                screenshot.size,
+                screenshot.bgra,
+                "raw",
+                "BGRX",
+            )
+            img.save(str(filepath), "JPEG", quality=self.jpeg_quality)
+        else:
+            import mss.tools
+
+            mss.tools.to_png(
+                screenshot.rgb,
+                screenshot.size,
+                output=str(filepath),
+            )
+
     def get_status(self) -> dict:
         """Get current worker status."""
         return {
             "running": self.running,
             "session_id": self.session_id,
             "screenshot_count": self.screenshot_count,
+            "dropped_count": self.dropped_count,
             "output_dir": str(self.output_dir),
             "interval_sec": self.interval_sec,
             "use_jpeg": self.use_jpeg,
@@ -635,15 +1173,12 @@ class CaptureManager:
         worker.monitor = monitor_id
         worker.capture_all = capture_all_monitors
 
-        # Take single screenshot
-        worker.session_id = "single"
-        worker.screenshot_count = 0
-        screenshot_path = worker._take_screenshot()
-
-        if screenshot_path:
-            # Rename to desired path
-            Path(screenshot_path).rename(output_path)
-            return output_path
+        # Capture straight to the requested path (no temp name + rename)
+        try:
+            if worker._capture_to(Path(output_path)):
+                return output_path
+        except Exception:
+            pass
 
         return None
 
@@ -661,25 +1196,7 @@ class CaptureManager:
             if not script_path.exists():
                 return {"error": "Detection script not found"}
 
-            # Find PowerShell
-            ps_paths = [
-                "powershell.exe",
-                "/mnt/c/Windows/System32/WindowsPowerShell/v1.0/powershell.exe",
-            ]
-
-            ps_exe = None
-            for path in ps_paths:
-                try:
-                    result = subprocess.run(
-                        [path, "-Command", "echo test"],
-                        capture_output=True,
-                        timeout=1,
-                    )
-                    if result.returncode == 0:
-                        ps_exe = path
-                        break
-                except:
-                    continue
+            ps_exe = _find_powershell()
 
             if not ps_exe:
                 return {"error": "PowerShell not found"}
@@ -700,8 +1217,6 @@ class CaptureManager:
 
             if result.returncode == 0 and result.stdout.strip():
                 # Parse JSON from output (skip non-JSON lines)
-                import json
-
                 lines = result.stdout.strip().split("\n")
                 for line in lines:
                     line = line.strip()
@@ -745,25 +1260,7 @@ class CaptureManager:
             if not script_path.exists():
                 return None
 
-            # Find PowerShell
-            ps_paths = [
-                "powershell.exe",
-                "/mnt/c/Windows/System32/WindowsPowerShell/v1.0/powershell.exe",
-            ]
-
-            ps_exe = None
-            for path in ps_paths:
-                try:
-                    result = subprocess.run(
-                        [path, "-Command", "echo test"],
-                        capture_output=True,
-                        timeout=1,
-                    )
-                    if result.returncode == 0:
-                        ps_exe = path
-                        break
-                except:
-                    continue
+            ps_exe = _find_powershell()
 
             if not ps_exe:
                 return None
@@ -786,9 +1283,6 @@ class CaptureManager:
 
             if result.returncode == 0 and result.stdout.strip():
                 # Parse JSON from output
-                import base64
-                import json
-
                 lines = result.stdout.strip().split("\n")
                 for line in lines:
                     line = line.strip()
@@ -815,17 +1309,10 @@ class CaptureManager:
                 # Save as JPEG or PNG
                 if jpeg:
                     try:
-                        import io
-
                         from PIL import Image
 
                         img = Image.open(io.BytesIO(img_data))
-                        if img.mode == "RGBA":
-                            rgb_img = Image.new(
-                                "RGB", img.size, (255, 255, 255)
-                            )
-                            rgb_img.paste(img, mask=img.split()[3])
-                            img = rgb_img
+                        img = _flatten_alpha(img)
                         img.save(
                             output_path, "JPEG", quality=quality, optimize=True
                         )
@@ -3,27 +3,17 @@
 # Timestamp: "2025-10-17 03:19:30 (ywatanabe)"
 # File: /home/ywatanabe/proj/cammy/src/cammy/cli.py
 # ----------------------------------------
-from __future__ import annotations
-import os
-__FILE__ = (
-    "./src/cammy/cli.py"
-)
-__DIR__ = os.path.dirname(__FILE__)
-# ----------------------------------------
 """
 CLI for cammy - AI's Camera
 """
 
-import argparse
+import functools
 import sys
+from types import SimpleNamespace
 
 
-def main():
-    """Main CLI entry point."""
-    parser = argparse.ArgumentParser(
-        description="cammy - AI's Camera: Capture screenshots from anywhere",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+_DESCRIPTION = "cammy - AI's Camera: Capture screenshots from anywhere"
+_EPILOG = """
 Examples:
   python -m cammy                        # Capture current screen
   python -m cammy --all                  # Capture all monitors
@@ -36,7 +26,137 @@ Examples:
   python -m cammy --stop                 # Stop monitoring
   python -m cammy --gif                  # Create GIF from session
   python -m cammy --mcp                  # Start MCP server
-        """,
+"""
+
+# `cammy --help` output pre-rendered from _get_parser() at 80 columns, so
+# plain -h/--help prints without importing or running argparse.
+# Regenerate with: COLUMNS=80 python -c "from cammy import cli;
+# print(cli._get_parser().format_help(), end='')"
+# argparse's layout differs by version ("optional arguments:" before 3.10,
+# "-o, --output OUTPUT" from 3.13), so the text is only used on the
+# versions it was rendered for: [_HELP_TEXT_PYTHON[0], _HELP_TEXT_PYTHON[1])
+_HELP_TEXT_PYTHON = ((3, 10), (3, 13))
+_HELP_TEXT = """\
+usage: cammy [-h] [--all] [--app APP] [--url URL] [--monitor MONITOR]
+             [--quality QUALITY] [-o OUTPUT] [--list] [--info] [--start]
+             [--stop] [--gif] [--mcp] [--interval INTERVAL] [-q]
+             [message]
+
+cammy - AI's Camera: Capture screenshots from anywhere
+
+positional arguments:
+  message               Optional message for filename
+
+options:
+  -h, --help            show this help message and exit
+  --all                 Capture all monitors
+  --app APP             App name to capture (e.g., chrome)
+  --url URL             URL to capture (e.g., 127.0.0.1:8000)
+  --monitor MONITOR     Monitor ID (0-based)
+  --quality QUALITY     JPEG quality (1-100)
+  -o OUTPUT, --output OUTPUT
+                        Output path
+  --list                List available windows
+  --info                Show display info
+  --start               Start monitoring
+  --stop                Stop monitoring
+  --gif                 Create GIF from latest session
+  --mcp                 Start MCP server
+  --interval INTERVAL   Monitoring interval in seconds
+  -q, --quiet           Quiet mode
+""" + _EPILOG
+
+# Defaults for every option, mirroring the argparse definitions below.
+# The fast path builds its namespace from these without touching argparse.
+_DEFAULTS = {
+    "message": None,
+    "all": False,
+    "app": None,
+    "url": None,
+    "monitor": 0,
+    "quality": 85,
+    "output": None,
+    "list": False,
+    "info": False,
+    "start": False,
+    "stop": False,
+    "gif": False,
+    "mcp": False,
+    "interval": 1.0,
+    "quiet": False,
+}
+
+# Value-free flags the fast path understands, mapped to their option name
+_FAST_ACTIONS = {
+    "--list": "list",
+    "--info": "info",
+    "--start": "start",
+    "--stop": "stop",
+    "--gif": "gif",
+    "--mcp": "mcp",
+}
+_FAST_FLAGS = {"-q": "quiet", "--quiet": "quiet", "--all": "all"}
+
+
+def _fast_parse(argv):
+    """
+    Parse trivial command lines without building an ArgumentParser.
+
+    Handles no arguments (plain capture) and a single action flag, plus
+    the value-free -q/--quiet and --all switches. Returns None for
+    anything else so the caller falls back to argparse.
+    """
+    values = dict(_DEFAULTS)
+    actions = 0
+    for arg in argv:
+        if arg in _FAST_ACTIONS:
+            values[_FAST_ACTIONS[arg]] = True
+            actions += 1
+        elif arg in _FAST_FLAGS:
+            values[_FAST_FLAGS[arg]] = True
+        else:
+            return None
+    if actions > 1:
+        return None
+    return SimpleNamespace(**values)
+
+
+def main(argv=None):
+    """Main CLI entry point."""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if argv in (["-h"], ["--help"]):
+        if _HELP_TEXT_PYTHON[0] <= sys.version_info[:2] < _HELP_TEXT_PYTHON[1]:
+            sys.stdout.write(_HELP_TEXT)
+        else:
+            _get_parser().print_help()
+        return 0
+
+    args = _fast_parse(argv)
+    if args is None:
+        args = _parse_args(argv)
+
+    return _run(args)
+
+
+def _parse_args(argv):
+    """Parse the full command line with argparse."""
+    return _get_parser().parse_args(argv)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_parser():
+    """Build the ArgumentParser once; repeated main() calls reuse it."""
+    # Imported here: argparse pulls in gettext, re, shutil and textwrap,
+    # none of which the fast path needs
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="cammy",
+        description=_DESCRIPTION,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG,
     )
 
     # Capture options
@@ -87,144 +207,193 @@ Examples:
         "-q", "--quiet", action="store_true", help="Quiet mode"
     )
 
-    args = parser.parse_args()
+    return parser
+
+
+# Action handlers in dispatch priority order; the first flag set wins and
+# no flag means a plain capture. Each handler imports only what it uses,
+# after parsing, so --help and argument errors never load the capture
+# machinery.
+def _do_list(args):
+    """List visible windows."""
+    from cammy import get_info
+
+    info = get_info()
+    windows = (info.get("Windows") or {}).get("Details") or []
+    # Collect lines and write once instead of one print per line
+    buf = [f"\n📱 Visible Windows ({len(windows)}):\n", "=" * 60 + "\n"]
+    for i, win in enumerate(windows, 1):
+        buf.append(f"{i}. [{win['ProcessName']}] {win['Title']}\n")
+        buf.append(f"   Handle: {win['Handle']} | PID: {win['ProcessId']}\n")
+    sys.stdout.write("".join(buf))
+    return 0
+
+
+def _do_info(args):
+    """Show monitor, window and virtual desktop info."""
+    from cammy import get_info
+
+    info = get_info()
+    monitors = info.get("Monitors") or {}
+    mon_details = monitors.get("Details") or []
+    windows = info.get("Windows") or {}
+    win_details = windows.get("Details") or []
+    vd = info.get("VirtualDesktops") or {}
+
+    buf = [
+        "\n🖥️  Display Information\n",
+        "=" * 60 + "\n",
+        f"\n📺 Monitors: {monitors.get('Count')}\n",
+        f"   Primary: {monitors.get('PrimaryMonitor')}\n",
+    ]
+
+    for i, mon in enumerate(mon_details):
+        bounds = mon.get("Bounds") or {}
+        buf.append(f"\n   Monitor {i}:\n")
+        buf.append(f"     Device: {mon.get('DeviceName')}\n")
+        buf.append(
+            f"     Resolution: {bounds.get('Width')}x{bounds.get('Height')}\n"
+        )
+        buf.append(f"     Primary: {mon.get('IsPrimary')}\n")
+
+    buf.append(f"\n🪟 Windows: {windows.get('VisibleCount')}\n")
+    buf.append(
+        f"   On current virtual desktop: {len(win_details)}\n"
+    )
+
+    buf.append(f"\n🖥️  Virtual Desktops:\n")
+    buf.append(f"   Supported: {vd.get('Supported')}\n")
+    buf.append(f"   Note: {vd.get('Note')}\n")
+
+    sys.stdout.write("".join(buf))
+    return 0
 
-    # Import cammy after parsing to avoid import overhead for --help
-    import cammy
 
-    verbose = not args.quiet
+def _do_start(args):
+    """Start monitoring and supervise it until Ctrl+C."""
+    from cammy import start, stop
+
+    print(f"📸 Starting monitoring (interval: {args.interval}s)...")
+    start(
+        interval=args.interval,
+        verbose=not args.quiet,
+        monitor_id=args.monitor,
+        all=args.all,
+    )
+    print(
+        "✅ Monitoring started. Press Ctrl+C to stop, or run: python -m cammy --stop"
+    )
+    print(f"📁 Saving to: ~/.cache/cammy/")
 
+    # Keep running; block until Ctrl+C rather than waking every second
     try:
-        # Handle actions
-        if args.list:
-            info = cammy.get_info()
-            windows = info.get("Windows", {}).get("Details", [])
-            print(f"\n📱 Visible Windows ({len(windows)}):")
-            print("=" * 60)
-            for i, win in enumerate(windows, 1):
-                print(f"{i}. [{win['ProcessName']}] {win['Title']}")
-                print(f"   Handle: {win['Handle']} | PID: {win['ProcessId']}")
-            return 0
-
-        elif args.info:
-            info = cammy.get_info()
-            monitors = info.get("Monitors", {})
-            windows = info.get("Windows", {})
-            vd = info.get("VirtualDesktops", {})
-
-            print("\n🖥️  Display Information")
-            print("=" * 60)
-            print(f"\n📺 Monitors: {monitors.get('Count')}")
-            print(f"   Primary: {monitors.get('PrimaryMonitor')}")
-
-            for i, mon in enumerate(monitors.get("Details", [])):
-                bounds = mon.get("Bounds", {})
-                print(f"\n   Monitor {i}:")
-                print(f"     Device: {mon.get('DeviceName')}")
-                print(
-                    f"     Resolution: {bounds.get('Width')}x{bounds.get('Height')}"
-                )
-                print(f"     Primary: {mon.get('IsPrimary')}")
-
-            print(f"\n🪟 Windows: {windows.get('VisibleCount')}")
-            print(
-                f"   On current virtual desktop: {len(windows.get('Details', []))}"
-            )
-
-            print(f"\n🖥️  Virtual Desktops:")
-            print(f"   Supported: {vd.get('Supported')}")
-            print(f"   Note: {vd.get('Note')}")
-
-            return 0
-
-        elif args.start:
-            print(f"📸 Starting monitoring (interval: {args.interval}s)...")
-            cammy.start(
-                interval=args.interval,
-                verbose=verbose,
-                monitor_id=args.monitor,
-                all=args.all,
-            )
-            print(
-                "✅ Monitoring started. Press Ctrl+C to stop, or run: python -m cammy --stop"
-            )
-            print(f"📁 Saving to: ~/.cache/cammy/")
-
-            # Keep running
-            try:
-                import time
-
-                while True:
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                cammy.stop()
-                print("\n✅ Monitoring stopped")
-
-            return 0
-
-        elif args.stop:
-            cammy.stop()
-            print("✅ Monitoring stopped")
-            return 0
-
-        elif args.gif:
-            print("📹 Creating GIF from latest session...")
-            path = cammy.gif()
-            if path:
-                print(f"✅ GIF created: {path}")
-                return 0
-            else:
-                print("❌ No session found")
-                return 1
-
-        elif args.mcp:
-            print("🤖 Starting cammy MCP server...")
-            print("Add to Claude Code settings:")
-            print("{")
-            print('  "mcpServers": {')
-            print('    "cammy": {')
-            print('      "command": "python",')
-            print('      "args": ["-m", "cammy", "--mcp"]')
-            print("    }")
-            print("  }")
-            print("}")
-            print()
-
-            # Start MCP server
-            import asyncio
-            from pathlib import Path
-
-            mcp_server_path = (
-                Path(__file__).parent.parent.parent / "mcp_server_cammy.py"
-            )
-
-            # Import and run MCP server
-            sys.path.insert(0, str(mcp_server_path.parent))
-            import mcp_server_cammy
-
-            asyncio.run(mcp_server_cammy.main())
-            return 0
-
-        # Default: capture screenshot
+        import signal
+
+        if hasattr(signal, "pause"):
+            while True:
+                signal.pause()
         else:
-            path = cammy.snap(
-                message=args.message,
-                path=args.output,
-                quality=args.quality,
-                monitor_id=args.monitor,
-                all=args.all,
-                app=args.app,
-                url=args.url,
-                verbose=verbose,
-            )
-
-            if path:
-                if not args.quiet:
-                    print(f"✅ {path}")
-                return 0
-            else:
-                print("❌ Screenshot failed")
-                return 1
+            # Windows has no signal.pause; time.sleep stays
+            # interruptible by Ctrl+C there
+            import time
+
+            while True:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        stop()
+        print("\n✅ Monitoring stopped")
+
+    return 0
+
+
+def _do_stop(args):
+    """Stop monitoring."""
+    from cammy import stop
+
+    stop()
+    print("✅ Monitoring stopped")
+    return 0
+
+
+def _do_gif(args):
+    """Create a GIF from the latest monitoring session."""
+    from cammy import gif
+
+    print("📹 Creating GIF from latest session...")
+    path = gif()
+    if path:
+        print(f"✅ GIF created: {path}")
+        return 0
+    else:
+        print("❌ No session found")
+        return 1
+
+
+def _do_mcp(args):
+    """Start the MCP server."""
+    sys.stdout.write(
+        "🤖 Starting cammy MCP server...\n"
+        "Add to Claude Code settings:\n"
+        "{\n"
+        '  "mcpServers": {\n'
+        '    "cammy": {\n'
+        '      "command": "python",\n'
+        '      "args": ["-m", "cammy", "--mcp"]\n'
+        "    }\n"
+        "  }\n"
+        "}\n"
+        "\n"
+    )
+
+    # Start MCP server (shipped inside the package, so it works from wheels)
+    import asyncio
+    from cammy import mcp_server
+
+    asyncio.run(mcp_server.main())
+    return 0
+
+
+def _do_capture(args):
+    """Capture a screenshot (default action)."""
+    from cammy import snap
+
+    path = snap(
+        message=args.message,
+        path=args.output,
+        quality=args.quality,
+        monitor_id=args.monitor,
+        all=args.all,
+        app=args.app,
+        url=args.url,
+        verbose=not args.quiet,
+    )
+
+    if path:
+        if not args.quiet:
+            print(f"✅ {path}")
+        return 0
+    else:
+        print("❌ Screenshot failed")
+        return 1
+
+
+_ACTIONS = {
+    "list": _do_list,
+    "info": _do_info,
+    "start": _do_start,
+    "stop": _do_stop,
+    "gif": _do_gif,
+    "mcp": _do_mcp,
+}
+
+
+def _run(args):
+    """Execute the action selected by parsed arguments."""
+    try:
+        for name, handler in _ACTIONS.items():
+            if getattr(args, name):
+                return handler(args)
+        return _do_capture(args)
 
     except KeyboardInterrupt:
         print("\n⚠️  Interrupted")
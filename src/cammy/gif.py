@@ -103,6 +103,7 @@ class GifCreator:
         duration: float = 0.5,
         optimize: bool = True,
         loop: int = 0,
+        shared_palette: bool = False,
     ) -> Optional[str]:
         """
         Create a GIF from a list of image files.
@@ -113,6 +114,7 @@ class GifCreator:
             duration: Duration per frame in seconds (default: 0.5)
             optimize: Optimize GIF for smaller file size (default: True)
             loop: Number of loops (0 = infinite, default: 0)
+            shared_palette: See create_gif_from_images (default: False)
 
         Returns:
             Path to created GIF file, or None if failed
@@ -132,19 +134,71 @@ class GifCreator:
                     continue
 
                 try:
-                    img = Image.open(path)
-                    # Convert to RGB if necessary (for consistency)
-                    if img.mode != "RGB":
-                        img = img.convert("RGB")
-                    images.append(img)
+                    # RGB conversion happens in create_gif_from_images
+                    images.append(Image.open(path))
                 except Exception as e:
                     print(f"Error loading image {path}: {e}")
                     continue
 
+            return self.create_gif_from_images(
+                images=images,
+                output_path=output_path,
+                duration=duration,
+                optimize=optimize,
+                loop=loop,
+                shared_palette=shared_palette,
+            )
+
+        except ImportError:
+            print(
+                "PIL (Pillow) is required for GIF creation. Install with: pip install Pillow"
+            )
+            return None
+        except Exception as e:
+            print(f"Error creating GIF: {e}")
+            return None
+
+    def create_gif_from_images(
+        self,
+        images: List["Image.Image"],
+        output_path: str,
+        duration: float = 0.5,
+        optimize: bool = True,
+        loop: int = 0,
+        shared_palette: bool = False,
+    ) -> Optional[str]:
+        """
+        Create a GIF from in-memory PIL images.
+
+        Avoids writing intermediate frames to disk and decoding them again,
+        e.g. for frames that are generated rather than captured.
+
+        Args:
+            images: List of PIL images (converted to RGB if necessary)
+            output_path: Output GIF path
+            duration: Duration per frame in seconds (default: 0.5)
+            optimize: Optimize GIF for smaller file size (default: True)
+            loop: Number of loops (0 = infinite, default: 0)
+            shared_palette: Quantize all frames to one palette and make
+                pixels unchanged since the previous frame transparent.
+                Much smaller output for mostly static content such as
+                UI recordings (default: False)
+
+        Returns:
+            Path to created GIF file, or None if failed
+        """
+        try:
+            from PIL import Image
+
             if not images:
                 print("No valid images found")
                 return None
 
+            images = [
+                img if img.mode == "RGB" else img.convert("RGB")
+                for img in images
+            ]
+
             # Ensure all images have the same size (resize to first image size)
             target_size = images[0].size
             for i in range(1, len(images)):
@@ -160,6 +214,12 @@ class GifCreator:
             # Save as GIF
             duration_ms = int(duration * 1000)  # Convert to milliseconds
 
+            extra = {}
+            if shared_palette and len(images) > 1:
+                images = self._diff_frames(images)
+                # Index 0 is transparent; keep the previous frame beneath it
+                extra = {"transparency": 0, "disposal": 1}
+
             images[0].save(
                 str(output_path),
                 format="GIF",
@@ -168,6 +228,7 @@ class GifCreator:
                 duration=duration_ms,
                 loop=loop,
                 optimize=optimize,
+                **extra,
             )
 
             if output_path.exists():
@@ -188,6 +249,58 @@ class GifCreator:
             print(f"Error creating GIF: {e}")
             return None
 
+    def _diff_frames(self, images: List["Image.Image"]) -> List["Image.Image"]:
+        """
+        Quantize frames to one shared palette and blank out static pixels.
+
+        All frames are stacked into a single image and quantized together
+        (255 colours), so every frame shares one palette. Palette index 0
+        is reserved as the transparent colour, and each pixel equal to the
+        one in the previous frame is set to it, which lets LZW compress
+        static regions to almost nothing.
+
+        Args:
+            images: Same-sized RGB images
+
+        Returns:
+            List of palette ("P") images sharing the same palette
+        """
+        from PIL import Image, ImageChops
+
+        width, height = images[0].size
+
+        # Quantize all frames at once so they share a palette
+        stacked = Image.new("RGB", (width, height * len(images)))
+        for i, img in enumerate(images):
+            stacked.paste(img, (0, i * height))
+        stacked = stacked.quantize(colors=255, dither=0)
+
+        # Shift the palette by one entry; index 0 becomes transparent
+        colors = stacked.getpalette()[: 255 * 3]
+        palette = [255, 0, 255] + colors + [0] * (255 * 3 - len(colors))
+
+        frames = []
+        previous = None
+        for i in range(len(images)):
+            band = stacked.crop((0, i * height, width, (i + 1) * height))
+            indices = Image.frombytes("L", (width, height), band.tobytes())
+            indices = indices.point(lambda v: v + 1)
+
+            out = indices
+            if previous is not None:
+                unchanged = ImageChops.difference(indices, previous).point(
+                    lambda v: 255 if v == 0 else 0
+                )
+                out = indices.copy()
+                out.paste(0, mask=unchanged)
+            previous = indices
+
+            frame = Image.frombytes("P", (width, height), out.tobytes())
+            frame.putpalette(palette)
+            frames.append(frame)
+
+        return frames
+
     def create_gif_from_pattern(
         self,
         pattern: str,
@@ -329,6 +442,12 @@ def create_gif_from_files(
     return creator.create_gif_from_files(image_paths, output_path, **kwargs)
 
 
+def create_gif_from_images(images: List, output_path: str, **kwargs) -> Optional[str]:
+    """Create GIF from in-memory PIL images."""
+    creator = GifCreator()
+    return creator.create_gif_from_images(images, output_path, **kwargs)
+
+
 def create_gif_from_pattern(pattern: str, **kwargs) -> Optional[str]:
     """Create GIF from files matching glob pattern."""
     creator = GifCreator()
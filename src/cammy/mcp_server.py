@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 # Timestamp: "2025-10-17 03:24:58 (ywatanabe)"
-# File: /home/ywatanabe/proj/cammy/mcp_server_cammy.py
+# File: /home/ywatanabe/proj/cammy/src/cammy/mcp_server.py
 # ----------------------------------------
 from __future__ import annotations
 import os
 __FILE__ = (
-    "./mcp_server_cammy.py"
+    "./src/cammy/mcp_server.py"
 )
 __DIR__ = os.path.dirname(__FILE__)
 # ----------------------------------------
@@ -542,7 +542,9 @@ class CAMServer:
 
             # Get file info
             path_obj = Path(path)
-            if not path_obj.exists():
+            try:
+                st = path_obj.stat()
+            except FileNotFoundError:
                 return {"success": False, "error": f"File not found: {path}"}
 
             return {
@@ -550,10 +552,8 @@ class CAMServer:
                 "path": path,
                 "category": category,
                 "is_error": category == "stderr",
-                "size_kb": round(path_obj.stat().st_size / 1024, 2),
-                "modified": datetime.fromtimestamp(
-                    path_obj.stat().st_mtime
-                ).isoformat(),
+                "size_kb": round(st.st_size / 1024, 2),
+                "modified": datetime.fromtimestamp(st.st_mtime).isoformat(),
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -594,14 +594,15 @@ class CAMServer:
                 cat = (
                     "stderr" if "-stderr.jpg" in screenshot.name else "stdout"
                 )
+                st = screenshot.stat()
                 result_list.append(
                     {
                         "filename": screenshot.name,
                         "path": str(screenshot),
                         "category": cat,
-                        "size_kb": round(screenshot.stat().st_size / 1024, 2),
+                        "size_kb": round(st.st_size / 1024, 2),
                         "modified": datetime.fromtimestamp(
-                            screenshot.stat().st_mtime
+                            st.st_mtime
                         ).isoformat(),
                     }
                 )
@@ -1,6 +1,15 @@
 param(
     [Parameter(Mandatory=$false)]
-    [string]$OutputFormat = "base64"  # "base64" or "file"
+    [string]$OutputFormat = "base64",  # "base64", "raw" (PNG bytes) or "file"
+
+    [Parameter(Mandatory=$false)]
+    [string]$OutputPath = "",  # Write the image here instead (prints "OK")
+
+    [Parameter(Mandatory=$false)]
+    [string]$ImageFormat = "png",  # "png" or "jpeg" (with -OutputPath)
+
+    [Parameter(Mandatory=$false)]
+    [int]$Quality = 85  # JPEG quality (with -OutputPath)
 )
 
 Add-Type -AssemblyName System.Windows.Forms
@@ -36,7 +45,27 @@ $graphics.PixelOffsetMode = [System.Drawing.Drawing2D.PixelOffsetMode]::HighQual
 $graphics.CopyFromScreen($virtualScreen.X, $virtualScreen.Y, 0, 0, $virtualScreen.Size)
 
 # Output based on format
-if ($OutputFormat -eq "base64") {
+if ($OutputPath) {
+    # Encode straight to the caller's file; nothing but a status crosses stdout
+    if ($ImageFormat -eq "jpeg") {
+        $jpegCodec = [System.Drawing.Imaging.ImageCodecInfo]::GetImageEncoders() | Where-Object { $_.MimeType -eq "image/jpeg" }
+        $encParams = New-Object System.Drawing.Imaging.EncoderParameters 1
+        $encParams.Param[0] = New-Object System.Drawing.Imaging.EncoderParameter([System.Drawing.Imaging.Encoder]::Quality, [long]$Quality)
+        $bitmap.Save($OutputPath, $jpegCodec, $encParams)
+    } else {
+        $bitmap.Save($OutputPath, [System.Drawing.Imaging.ImageFormat]::Png)
+    }
+    Write-Output "OK"
+} elseif ($OutputFormat -eq "raw") {
+    # Binary PNG straight to stdout: no base64 inflation, no decoding on the
+    # WSL side
+    $stream = New-Object System.IO.MemoryStream
+    $bitmap.Save($stream, [System.Drawing.Imaging.ImageFormat]::Png)
+    $stdout = [Console]::OpenStandardOutput()
+    $stream.WriteTo($stdout)
+    $stdout.Flush()
+    $stream.Dispose()
+} elseif ($OutputFormat -eq "base64") {
     # Convert to base64 for easy transfer to WSL
     $stream = New-Object System.IO.MemoryStream
     $bitmap.Save($stream, [System.Drawing.Imaging.ImageFormat]::Png)
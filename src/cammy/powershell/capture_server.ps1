@@ -0,0 +1,118 @@
+# Long-lived capture loop for the monitoring worker.
+# Reads one request per line from stdin and answers with a base64 PNG line
+# followed by a sentinel line, so the .NET assemblies and DPI setup are paid
+# for once instead of on every screenshot.
+#
+# Requests:
+#   <n>   capture monitor n (0-based index)
+#   all   capture the whole virtual screen (all monitors combined)
+# A request may carry tab-separated <path> <png|jpeg> <quality> fields; the
+# image is then saved straight to that (Windows) path and the data line is
+# "OK" instead of base64.
+# An empty data line before the sentinel means the capture failed.
+
+Add-Type -AssemblyName System.Windows.Forms
+Add-Type -AssemblyName System.Drawing
+
+# Enable DPI awareness for proper high-resolution capture
+Add-Type @'
+using System;
+using System.Runtime.InteropServices;
+public class User32 {
+    [DllImport("user32.dll")]
+    public static extern bool SetProcessDPIAware();
+}
+'@
+
+$null = [User32]::SetProcessDPIAware()
+
+$Sentinel = "---EOF---"
+
+$JpegCodec = [System.Drawing.Imaging.ImageCodecInfo]::GetImageEncoders() | Where-Object { $_.MimeType -eq "image/jpeg" }
+
+# Capture surface reused across requests; reallocated only when the
+# requested size changes (monitor switch or resolution change)
+$script:Bitmap = $null
+$script:Graphics = $null
+$script:Stream = New-Object System.IO.MemoryStream
+
+function Get-Surface($width, $height) {
+    if ($null -eq $script:Bitmap -or $script:Bitmap.Width -ne $width -or $script:Bitmap.Height -ne $height) {
+        if ($null -ne $script:Graphics) { $script:Graphics.Dispose() }
+        if ($null -ne $script:Bitmap) { $script:Bitmap.Dispose() }
+
+        $script:Bitmap = New-Object System.Drawing.Bitmap $width, $height
+        $script:Graphics = [System.Drawing.Graphics]::FromImage($script:Bitmap)
+
+        # Set high quality rendering
+        $script:Graphics.CompositingQuality = [System.Drawing.Drawing2D.CompositingQuality]::HighQuality
+        $script:Graphics.InterpolationMode = [System.Drawing.Drawing2D.InterpolationMode]::HighQualityBicubic
+        $script:Graphics.SmoothingMode = [System.Drawing.Drawing2D.SmoothingMode]::HighQuality
+        $script:Graphics.PixelOffsetMode = [System.Drawing.Drawing2D.PixelOffsetMode]::HighQuality
+    }
+}
+
+function Capture-Bounds($bounds, $outPath, $format, $quality) {
+    Get-Surface $bounds.Width $bounds.Height
+    $bitmap = $script:Bitmap
+
+    $script:Graphics.CopyFromScreen($bounds.X, $bounds.Y, 0, 0, $bounds.Size)
+
+    if ($outPath) {
+        if ($format -eq "jpeg") {
+            $encParams = New-Object System.Drawing.Imaging.EncoderParameters 1
+            $encParams.Param[0] = New-Object System.Drawing.Imaging.EncoderParameter([System.Drawing.Imaging.Encoder]::Quality, [long]$quality)
+            $bitmap.Save($outPath, $JpegCodec, $encParams)
+            $encParams.Dispose()
+        }
+        else {
+            $bitmap.Save($outPath, [System.Drawing.Imaging.ImageFormat]::Png)
+        }
+        $data = "OK"
+    }
+    else {
+        $script:Stream.SetLength(0)
+        $bitmap.Save($script:Stream, [System.Drawing.Imaging.ImageFormat]::Png)
+        $data = [Convert]::ToBase64String($script:Stream.GetBuffer(), 0, [int]$script:Stream.Length)
+    }
+
+    return $data
+}
+
+while ($null -ne ($line = [Console]::In.ReadLine())) {
+    $data = ""
+    try {
+        $fields = $line.Split("`t")
+        $request = $fields[0].Trim()
+        $outPath = $null
+        $format = "png"
+        $quality = 85
+        if ($fields.Count -ge 4) {
+            $outPath = $fields[1]
+            $format = $fields[2].Trim()
+            $quality = [int]$fields[3]
+        }
+        if ($request -eq "all") {
+            $bounds = [System.Windows.Forms.SystemInformation]::VirtualScreen
+            $data = Capture-Bounds $bounds $outPath $format $quality
+        }
+        else {
+            # Screens are re-read per request so hot-plugged monitors show up
+            $screens = [System.Windows.Forms.Screen]::AllScreens
+            $index = [int]$request
+            if ($index -ge 0 -and $index -lt $screens.Count) {
+                $data = Capture-Bounds $screens[$index].Bounds $outPath $format $quality
+            }
+        }
+    }
+    catch {
+        $data = ""
+    }
+    [Console]::Out.WriteLine($data)
+    [Console]::Out.WriteLine($Sentinel)
+    [Console]::Out.Flush()
+}
+
+if ($null -ne $script:Graphics) { $script:Graphics.Dispose() }
+if ($null -ne $script:Bitmap) { $script:Bitmap.Dispose() }
+$script:Stream.Dispose()
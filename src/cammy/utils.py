@@ -11,7 +11,14 @@ __FILE__ = (
 __DIR__ = os.path.dirname(__FILE__)
 # ----------------------------------------
 
+import heapq
+import operator
+import re
+import stat
 import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 """
 Utility functions for easy screen capture.
@@ -21,13 +28,90 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from .capture import CaptureManager, ScreenshotWorker
+from .capture import (
+    CaptureManager,
+    ScreenshotWorker,
+    _flatten_alpha,
+    _ms_timestamp,
+)
 
 # Global manager instance
 _manager = CaptureManager()
 
+# Filename normalisation for capture() messages
+_MSG_STRIP_RE = re.compile(r"[^\w\s-]")
+_MSG_COLLAPSE_RE = re.compile(r"[-\s]+")
+
+# Filename keywords that mark a capture as stderr (errors and warnings)
+_STDERR_NAME_RE = re.compile(
+    r"error|fail|exception|crash|warn|alert|caution"
+)
+
+# Staging directory for capture() before a frame gets its final name
+_TEMP_DIR = "/tmp/cammy_temp"
+
+# Directories capture() has already created in this process
+_dirs_created = set()
+
+
+def _normalize_message(message: Optional[str]) -> str:
+    """
+    Turn a capture() message into its filename fragment.
+
+    Parameters
+    ----------
+    message : str, optional
+        Message passed to capture()
+
+    Returns
+    -------
+    str
+        "-" followed by the first line with special characters removed and
+        runs of spaces/dashes collapsed to "-", cut to 50 characters; empty
+        if nothing usable is left
+    """
+    if not message:
+        return ""
+    # Remove special chars, keep only alphanumeric and spaces
+    normalized = _MSG_STRIP_RE.sub("", message.split("\n", 1)[0])  # First line only
+    normalized = _MSG_COLLAPSE_RE.sub("-", normalized).strip("-")
+    return f"-{normalized[:50]}" if normalized else ""  # Limit length
+
+
+def _ensure_dir(directory: str):
+    """Create directory (with parents) once per process."""
+    if directory not in _dirs_created:
+        os.makedirs(directory, exist_ok=True)
+        _dirs_created.add(directory)
+
 
-def _manage_cache_size(cache_dir: Path, max_size_gb: float = 1.0):
+# Evictions larger than this are unlinked from a thread pool
+_PARALLEL_UNLINK_MIN = 64
+
+
+def _unlink(path: str) -> bool:
+    """Remove a file, returning whether it was actually deleted."""
+    try:
+        os.unlink(path)
+        return True
+    except OSError:
+        return False  # File might be in use
+
+
+def _oldest_first(files: list, k: int):
+    """
+    Yield (path, size, mtime_ns) tuples oldest first.
+
+    Only the k oldest are selected up front with a heap (O(n log k)); the
+    rest are sorted only if the caller keeps iterating past them.
+    """
+    by_mtime = operator.itemgetter(2)
+    yield from heapq.nsmallest(k, files, key=by_mtime)
+    if k < len(files):
+        yield from sorted(files, key=by_mtime)[k:]
+
+
+def _manage_cache_size(cache_dir: Path, max_size_gb: float = 1.0) -> int:
     """
     Manage cache directory size by removing old files if size exceeds limit.
 
@@ -37,47 +121,146 @@ def _manage_cache_size(cache_dir: Path, max_size_gb: float = 1.0):
         Directory to manage
     max_size_gb : float
         Maximum size in GB (default: 1.0)
+
+    Returns
+    -------
+    int
+        Bytes of JPG/PNG files left in the cache
     """
     if not cache_dir.exists():
-        return
+        return 0
 
     max_size_bytes = max_size_gb * 1024 * 1024 * 1024  # Convert GB to bytes
 
-    # Get all files with their sizes and modification times
+    # Get all JPG/PNG files with their sizes and modification times in one
+    # directory pass, one stat per file
     files = []
     total_size = 0
 
-    for file_path in cache_dir.glob("*.jpg"):
-        if file_path.is_file():
-            size = file_path.stat().st_size
-            mtime = file_path.stat().st_mtime
-            files.append((file_path, size, mtime))
-            total_size += size
-
-    # Also check PNG files
-    for file_path in cache_dir.glob("*.png"):
-        if file_path.is_file():
-            size = file_path.stat().st_size
-            mtime = file_path.stat().st_mtime
-            files.append((file_path, size, mtime))
-            total_size += size
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if not entry.name.endswith((".jpg", ".png")):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue
+            files.append((entry.path, st.st_size, st.st_mtime_ns))
+            total_size += st.st_size
 
     # If under limit, nothing to do
     if total_size <= max_size_bytes:
-        return
+        return total_size
+
+    # Estimate how many of the oldest files must go (with headroom) rather
+    # than sorting the whole cache
+    avg_size = total_size / len(files)
+    k = max(16, int((total_size - max_size_bytes) / avg_size * 1.5))
+
+    # Remove oldest files until under limit: pick enough of them to cover
+    # the excess, delete that batch, and repeat only if some deletions failed
+    candidates = _oldest_first(files, k)
+    while total_size > max_size_bytes:
+        batch = []
+        excess = total_size - max_size_bytes
+        for file_path, size, _ in candidates:
+            batch.append((file_path, size))
+            excess -= size
+            if excess <= 0:
+                break
+        if not batch:
+            break
 
-    # Sort by modification time (oldest first)
-    files.sort(key=lambda x: x[2])
+        paths = [file_path for file_path, _ in batch]
+        if len(paths) > _PARALLEL_UNLINK_MIN:
+            # unlink is syscall-bound; threads overlap the kernel work
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                removed = list(pool.map(_unlink, paths))
+        else:
+            removed = list(map(_unlink, paths))
+        total_size -= sum(
+            size for (_, size), ok in zip(batch, removed) if ok
+        )
 
-    # Remove oldest files until under limit
-    for file_path, size, _ in files:
-        if total_size <= max_size_bytes:
-            break
-        try:
-            file_path.unlink()
-            total_size -= size
-        except:
-            pass  # File might be in use
+    return total_size
+
+
+# Cache size as of the last check, kept up to date by capture() so the cache
+# directory is only rescanned when the quota may be exceeded. The cache dir
+# mtime recorded alongside detects files written by anyone else (e.g. the
+# monitoring worker), which invalidates the estimate.
+_cache_bytes_estimate = None
+_cache_dir_mtime_ns = None
+# Guards the read-modify-write of the two globals above; capture() may run
+# on several threads at once (e.g. the MCP server's worker threads)
+_cache_lock = threading.Lock()
+
+
+def _cache_unchanged(cache_dir: Path) -> bool:
+    """Whether cache_dir is untouched since the last quota check."""
+    try:
+        return os.stat(cache_dir).st_mtime_ns == _cache_dir_mtime_ns
+    except OSError:
+        return False
+
+
+def _update_cache_size(
+    cache_dir: Path, new_file: Path, max_size_gb: float, trusted: bool
+):
+    """
+    Account for a newly saved capture and enforce the cache quota.
+
+    Parameters
+    ----------
+    cache_dir : Path
+        Cache directory
+    new_file : Path
+        File just written by capture()
+    max_size_gb : float
+        Maximum size in GB
+    trusted : bool
+        Result of _cache_unchanged() taken before new_file was written;
+        False forces a full scan
+
+    Scans and evictions run before returning, so the quota holds even for
+    one-shot processes that exit right after capture().
+    """
+    global _cache_bytes_estimate, _cache_dir_mtime_ns
+
+    max_size_bytes = max_size_gb * 1024 * 1024 * 1024
+    with _cache_lock:
+        estimate = _cache_bytes_estimate if trusted else None
+        if estimate is not None:
+            if new_file.parent == cache_dir and new_file.suffix in (
+                ".jpg",
+                ".png",
+            ):
+                try:
+                    estimate += new_file.stat().st_size
+                except OSError:
+                    estimate = None
+
+        if estimate is not None and estimate <= max_size_bytes:
+            _cache_bytes_estimate = estimate
+            _cache_dir_mtime_ns = _dir_mtime_ns(cache_dir)
+            return
+
+        # mtime taken before the scan: a file written while it runs (or an
+        # eviction) leaves the recorded mtime stale, so the next call
+        # rescans instead of trusting an estimate that misses those bytes
+        mtime_ns = _dir_mtime_ns(cache_dir)
+        _cache_bytes_estimate = _manage_cache_size(cache_dir, max_size_gb)
+        _cache_dir_mtime_ns = mtime_ns
+
+
+def _dir_mtime_ns(directory: Path) -> Optional[int]:
+    """Directory mtime in ns, or None if it can't be read."""
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
 
 
 def capture(
@@ -301,16 +484,7 @@ def capture(
                                             img = Image.open(
                                                 io.BytesIO(img_data)
                                             )
-                                            if img.mode == "RGBA":
-                                                rgb_img = Image.new(
-                                                    "RGB",
-                                                    img.size,
-                                                    (255, 255, 255),
-                                                )
-                                                rgb_img.paste(
-                                                    img, mask=img.split()[3]
-                                                )
-                                                img = rgb_img
+                                            img = _flatten_alpha(img)
                                             img.save(
                                                 path,
                                                 "JPEG",
@@ -377,9 +551,9 @@ def capture(
         capture_all = True
 
     # Take screenshot first to analyze it
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-    temp_dir = "/tmp/cammy_temp"
-    Path(temp_dir).mkdir(exist_ok=True)
+    timestamp = _ms_timestamp()
+    temp_dir = _TEMP_DIR
+    _ensure_dir(temp_dir)
 
     # Take screenshot to temp location
     use_jpeg = (
@@ -394,11 +568,18 @@ def capture(
         verbose=verbose,  # Use the verbose parameter passed by user
     )
 
-    worker.session_id = "capture"
+    # Per-thread temp names, so concurrent capture() calls don't collide
+    worker.session_id = f"capture{threading.get_ident()}"
     worker.screenshot_count = 0
     worker.monitor = monitor_id
     worker.capture_all = capture_all
     temp_path = worker._take_screenshot()
+    if not temp_path and not os.path.isdir(temp_dir):
+        # Staging dir removed since we created it (e.g. tmp cleanup under a
+        # long-running process); re-create it and retry once
+        _dirs_created.discard(temp_dir)
+        _ensure_dir(temp_dir)
+        temp_path = worker._take_screenshot()
 
     if not temp_path:
         return None
@@ -430,18 +611,7 @@ def capture(
     # monitor_id=0 (primary) gets no tag for cleaner default names
 
     # Normalize message for filename
-    normalized_msg = ""
-    if message:
-        # Remove special chars, keep only alphanumeric and spaces
-        import re
-
-        normalized = re.sub(
-            r"[^\w\s-]", "", message.split("\n")[0]
-        )  # First line only
-        normalized = re.sub(r"[-\s]+", "-", normalized).strip("-")
-        normalized_msg = (
-            f"-{normalized[:50]}" if normalized else ""
-        )  # Limit length
+    normalized_msg = _normalize_message(message)
 
     # Add category suffix
     category_suffix = f"-{category}"
@@ -465,12 +635,22 @@ def capture(
         path = path.replace("<category_suffix>", category_suffix)
 
     # Ensure directory exists
-    output_dir = Path(path).parent
-    output_dir.mkdir(parents=True, exist_ok=True)
+    output_dir = os.path.dirname(path) or "."
+    _ensure_dir(output_dir)
+
+    # Checked before our own write changes the cache dir mtime
+    cache_dir = Path(os.path.expanduser("~/.cache/cammy"))
+    cache_unchanged = _cache_unchanged(cache_dir)
 
     # Move to final location
     final_path = Path(path)
-    Path(temp_path).rename(final_path)
+    try:
+        os.replace(temp_path, path)
+    except FileNotFoundError:
+        # Directory removed since we created it (e.g. cache cleared)
+        _dirs_created.discard(output_dir)
+        _ensure_dir(output_dir)
+        os.replace(temp_path, path)
 
     # Add message with category as metadata
     if message or category != "stdout":
@@ -482,9 +662,10 @@ def capture(
         _add_message_metadata(str(final_path), metadata)
 
     # Manage cache size (remove old files if needed)
-    cache_dir = Path(os.path.expanduser("~/.cache/cammy"))
     if cache_dir.exists():
-        _manage_cache_size(cache_dir, max_cache_gb)
+        _update_cache_size(
+            cache_dir, final_path, max_cache_gb, cache_unchanged
+        )
 
     # Print path for user feedback (useful in interactive sessions)
     final_path_str = str(final_path)
@@ -606,11 +787,14 @@ def _is_in_exception_context() -> bool:
     """
     Check if we're currently in an exception handler.
     """
-    import sys
+    # Check if there's an active exception (a read of the thread state)
+    return sys.exc_info()[0] is not None
+
 
-    # Check if there's an active exception
-    exc_info = sys.exc_info()
-    return exc_info[0] is not None
+# Channel threshold lookup tables for _detect_category (255 = condition met)
+_LUT_GT_200 = [255 if v > 200 else 0 for v in range(256)]
+_LUT_GT_150 = [255 if v > 150 else 0 for v in range(256)]
+_LUT_LT_100 = [255 if v < 100 else 0 for v in range(256)]
 
 
 def _detect_category(filepath: str) -> str:
@@ -624,18 +808,32 @@ def _detect_category(filepath: str) -> str:
 
         img = Image.open(filepath)
 
+        # Analyse a thumbnail. NEAREST keeps original pixel colours, so thin
+        # red/yellow glyphs are sampled rather than blended into the
+        # background; reducing_gap=None stops JPEG draft mode from
+        # averaging them away during decode for the same reason
+        img.thumbnail((256, 256), Image.NEAREST, reducing_gap=None)
+
         # Simple color-based heuristics
         # Red dominant = likely error
         # Yellow/orange dominant = likely warning
-        pixels = img.convert("RGB").getdata()
-        red_count = sum(
-            1 for r, g, b in pixels if r > 200 and g < 100 and b < 100
+        # Per-band thresholds and the AND run in PIL's C core; only the
+        # histogram of each mask comes back to Python
+        from PIL import ImageChops
+
+        r, g, b = img.convert("RGB").split()
+        r_high = r.point(_LUT_GT_200, "1")
+        b_low = b.point(_LUT_LT_100, "1")
+        red_mask = ImageChops.logical_and(
+            ImageChops.logical_and(r_high, g.point(_LUT_LT_100, "1")), b_low
         )
-        yellow_count = sum(
-            1 for r, g, b in pixels if r > 200 and g > 150 and b < 100
+        yellow_mask = ImageChops.logical_and(
+            ImageChops.logical_and(r_high, g.point(_LUT_GT_150, "1")), b_low
         )
+        red_count = red_mask.histogram()[255]
+        yellow_count = yellow_mask.histogram()[255]
 
-        total_pixels = len(pixels)
+        total_pixels = img.width * img.height
         red_ratio = red_count / total_pixels if total_pixels > 0 else 0
         yellow_ratio = yellow_count / total_pixels if total_pixels > 0 else 0
 
@@ -648,30 +846,163 @@ def _detect_category(filepath: str) -> str:
     except:
         pass
 
-    # Check filename for common error keywords
-    filename_lower = str(filepath).lower()
-    if any(
-        word in filename_lower
-        for word in ["error", "fail", "exception", "crash"]
-    ):
+    # Check filename for common error keywords (warnings also go to stderr)
+    if _STDERR_NAME_RE.search(str(filepath).lower()):
         return "stderr"
-    elif any(word in filename_lower for word in ["warn", "alert", "caution"]):
-        return "stderr"  # Warnings also go to stderr
 
     return "stdout"
 
 
+# EXIF UserComment tag, where capture() stores its message
+_USER_COMMENT_TAG = 0x9286
+
+
+def _rewrite_file(filepath: str, *parts: bytes):
+    """
+    Replace filepath with the concatenation of parts.
+
+    The bytes go to a sibling temp file that is renamed over filepath, so
+    an interrupted write or a full disk never leaves a truncated image.
+    """
+    directory, name = os.path.split(os.path.abspath(filepath))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{name}.", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for part in parts:
+                f.write(part)
+        # mkstemp creates 0600; keep the original file's permissions
+        os.chmod(tmp_path, stat.S_IMODE(os.stat(filepath).st_mode))
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _splice_jpeg_exif(filepath: str, exif) -> bool:
+    """
+    Insert an EXIF segment into a JPEG file without re-encoding it.
+
+    Parameters
+    ----------
+    filepath : str
+        JPEG file to update in place
+    exif : PIL.Image.Exif
+        EXIF data to embed
+
+    Returns
+    -------
+    bool
+        False if the file is not a JPEG, already carries EXIF, or the data
+        is too large for one segment; the caller then re-saves with PIL
+    """
+    payload = exif.tobytes()  # Starts with the b"Exif\0\0" header
+    if len(payload) + 2 > 0xFFFF:
+        return False
+
+    with open(filepath, "rb") as f:
+        data = f.read()
+    if data[:2] != b"\xff\xd8":
+        return False
+
+    # Walk the APPn segments after SOI; EXIF goes after a JFIF APP0
+    insert_at = 2
+    pos = 2
+    while (
+        pos + 4 <= len(data)
+        and data[pos] == 0xFF
+        and 0xE0 <= data[pos + 1] <= 0xEF
+    ):
+        seg_len = int.from_bytes(data[pos + 2 : pos + 4], "big")
+        marker = data[pos + 1]
+        if marker == 0xE1 and data[pos + 4 : pos + 10] == b"Exif\0\0":
+            return False
+        if marker == 0xE0 and pos == 2:
+            insert_at = pos + 2 + seg_len
+        pos += 2 + seg_len
+
+    segment = b"\xff\xe1" + (len(payload) + 2).to_bytes(2, "big") + payload
+    _rewrite_file(filepath, data[:insert_at], segment, data[insert_at:])
+    return True
+
+
+def _splice_png_exif(filepath: str, exif) -> bool:
+    """
+    Insert an eXIf chunk into a PNG file without re-encoding it.
+
+    Parameters
+    ----------
+    filepath : str
+        PNG file to update in place
+    exif : PIL.Image.Exif
+        EXIF data to embed
+
+    Returns
+    -------
+    bool
+        False if the file is not a PNG or already carries EXIF; the caller
+        then re-saves with PIL
+    """
+    import zlib
+
+    with open(filepath, "rb") as f:
+        data = f.read()
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        return False
+
+    # eXIf must precede the image data: find the first IDAT chunk
+    pos = 8
+    while pos + 8 <= len(data):
+        length = int.from_bytes(data[pos : pos + 4], "big")
+        chunk_type = data[pos + 4 : pos + 8]
+        if chunk_type == b"eXIf":
+            return False
+        if chunk_type == b"IDAT":
+            break
+        pos += 12 + length
+    else:
+        return False
+
+    payload = exif.tobytes()[6:]  # TIFF data without the Exif header
+    chunk_body = b"eXIf" + payload
+    chunk = (
+        len(payload).to_bytes(4, "big")
+        + chunk_body
+        + zlib.crc32(chunk_body).to_bytes(4, "big")
+    )
+    _rewrite_file(filepath, data[:pos], chunk, data[pos:])
+    return True
+
+
 def _add_message_metadata(filepath: str, message: str):
     """Add message as metadata to image file."""
     try:
         # Try to add EXIF comment using PIL
         from PIL import Image
 
+        # JPEGs and PNGs get the EXIF block spliced in directly: no decode
+        # and no (for JPEG, lossy) re-encode of the capture
+        suffix = str(filepath).lower().rsplit(".", 1)[-1]
+        splice = {
+            "jpg": _splice_jpeg_exif,
+            "jpeg": _splice_jpeg_exif,
+            "png": _splice_png_exif,
+        }.get(suffix)
+        if splice is not None:
+            exif = Image.Exif()
+            exif[_USER_COMMENT_TAG] = message
+            if splice(filepath, exif):
+                return
+
         img = Image.open(filepath)
 
         # Add comment to image metadata
         exif = img.getexif()
-        exif[0x9286] = message  # UserComment EXIF tag
+        exif[_USER_COMMENT_TAG] = message
 
         # Save with metadata
         img.save(filepath, exif=exif)
@@ -2,9 +2,46 @@
 Pytest configuration for cammy tests.
 """
 
+import asyncio
 import os
 import pytest
-from pathlib import Path
+
+# Tool/resource listings of the MCP server, gathered once in pytest_configure
+_MCP_REGISTRY = pytest.StashKey[dict]()
+
+
+async def _list_mcp_registry(mcp):
+    """Open one client and list the server's tools and resources."""
+    from fastmcp import Client
+
+    async with Client(mcp) as client:
+        return {
+            "tools": await client.list_tools(),
+            "resources": await client.list_resources(),
+        }
+
+
+def pytest_configure(config):
+    """Import the MCP server and list its registry before any test runs."""
+    try:
+        from mcp_server_fastmcp import mcp
+    except Exception:
+        # test_mcp_server.py reports the import failure itself
+        return
+    try:
+        config.stash[_MCP_REGISTRY] = asyncio.run(_list_mcp_registry(mcp))
+    except Exception as e:
+        # Surface it from the tests that need the registry
+        config.stash[_MCP_REGISTRY] = {"error": e}
+
+
+@pytest.fixture(scope="session")
+def mcp_registry(pytestconfig):
+    """Tools and resources of the MCP server, listed at configure time."""
+    registry = pytestconfig.stash[_MCP_REGISTRY]
+    if "error" in registry:
+        raise registry["error"]
+    return registry
 
 
 @pytest.fixture(autouse=True)
@@ -12,18 +49,17 @@ def cleanup_test_files():
     """Automatically cleanup test files after each test."""
     yield
     
-    # Cleanup any test files in /tmp
-    for path in Path("/tmp").glob("test-*.jpg"):
-        try:
-            path.unlink()
-        except:
-            pass
-    
-    for path in Path("/tmp").glob("screenshot_*.jpg"):
-        try:
-            path.unlink()
-        except:
-            pass
+    # Cleanup any test files in /tmp (one directory pass for both patterns)
+    with os.scandir("/tmp") as it:
+        for entry in it:
+            name = entry.name
+            if name.endswith(".jpg") and name.startswith(
+                ("test-", "screenshot_")
+            ):
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
 
 
 @pytest.fixture
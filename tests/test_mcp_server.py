@@ -4,48 +4,117 @@ Tests for CAM MCP Server (FastMCP version)
 """
 
 import pytest
+import pytest_asyncio
 import asyncio
-from pathlib import Path
-import tempfile
-import shutil
-import json
+import base64
+import importlib
+import os
 from unittest.mock import patch, MagicMock
+
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
 from datetime import datetime
 
 # Import the FastMCP server
+import mcp_server_fastmcp
 from mcp_server_fastmcp import mcp
 from fastmcp import Client
 
+# Stand-in screenshot payload and its base64 form, built once
+_FAKE_IMG = b"fake_image_data"
+_FAKE_IMG_B64 = base64.b64encode(_FAKE_IMG).decode()
 
-class TestCAMMCPServer:
-    """Test suite for CAM MCP server functionality."""
+# Fixture file names: two stdout captures and one stderr, and frames of two
+# monitoring sessions
+_RECENT_FILES = (
+    "20250824_120000_001-stdout.jpg",
+    "20250824_120001_002-stderr.jpg",
+    "20250824_120002_003-stdout.jpg",
+)
+_SESSION_FILES = (
+    "20250824_120000_001.jpg",
+    "20250824_120000_002.jpg",
+    "20250824_130000_001.jpg",
+)
 
-    @pytest.fixture
-    def temp_cache_dir(self):
-        """Create a temporary cache directory for testing."""
-        temp_dir = tempfile.mkdtemp()
-        cache_dir = Path(temp_dir) / ".cache" / "cammy"
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Mock the cache directory
-        with patch('pathlib.Path.home') as mock_home:
-            mock_home.return_value = Path(temp_dir)
-            yield cache_dir
-        
-        # Cleanup
-        shutil.rmtree(temp_dir)
 
-    @pytest.fixture
-    async def client(self):
-        """Create an MCP client for testing."""
-        async with Client(mcp) as client:
-            yield client
+def _direct(tool):
+    """Plain function behind a registered MCP tool, callable without a client."""
+    return getattr(tool, "fn", tool)
 
-    @pytest.mark.asyncio
-    async def test_server_tools_available(self, client):
+
+def _p(base, name):
+    """Join a file name onto a directory string without building a Path."""
+    return base + os.sep + name
+
+
+def _make_fakes(directory, names, data=b"x"):
+    """Create one file per name in directory, all holding the same bytes."""
+    base = os.fspath(directory)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    for name in names:
+        fd = os.open(_p(base, name), flags, 0o644)
+        try:
+            if data:
+                os.write(fd, data)
+        finally:
+            os.close(fd)
+
+
+@pytest.fixture(scope="session")
+def _cammy_home(tmp_path_factory):
+    """Fake home directory, set once for the whole session."""
+    home = tmp_path_factory.mktemp("home")
+    # Path.home() reads these directly, so no mock is needed
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("HOME", str(home))
+        mp.setenv("USERPROFILE", str(home))
+        yield home
+
+
+@pytest.fixture
+def temp_cache_dir(_cammy_home, tmp_path_factory, monkeypatch):
+    """Create a temporary cache directory for testing."""
+    # mktemp dirs are removed in bulk by pytest, not per test
+    cache_dir = tmp_path_factory.mktemp("case") / ".cache" / "cammy"
+    cache_dir.mkdir(parents=True)
+
+    # Mock the cache directory
+    monkeypatch.setattr('mcp_server_fastmcp.CACHE_DIR', cache_dir)
+    monkeypatch.setattr(
+        'mcp_server_fastmcp.MONITORING_FILE', cache_dir / ".monitoring"
+    )
+    return cache_dir
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client():
+    """One MCP client shared by every test in the session."""
+    async with Client(mcp) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def server_tools(mcp_registry):
+    """Tool registry, listed once in conftest's pytest_configure."""
+    return mcp_registry["tools"]
+
+
+@pytest.fixture(scope="session")
+def server_resources(mcp_registry):
+    """Resource registry, listed once in conftest's pytest_configure."""
+    return mcp_registry["resources"]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestCAMMCPServer:
+    """Test suite for CAM MCP server functionality."""
+
+    async def test_server_tools_available(self, server_tools):
         """Test that all expected tools are available."""
-        tools = await client.list_tools()
-        tool_names = {tool.name for tool in tools}
+        tool_names = {tool.name for tool in server_tools}
         
         expected_tools = {
             "capture_screenshot",
@@ -61,11 +130,9 @@ class TestCAMMCPServer:
         
         assert expected_tools.issubset(tool_names), f"Missing tools: {expected_tools - tool_names}"
 
-    @pytest.mark.asyncio
-    async def test_server_resources_available(self, client):
+    async def test_server_resources_available(self, server_resources):
         """Test that resources are available."""
-        resources = await client.list_resources()
-        resource_uris = {resource.uri for resource in resources}
+        resource_uris = {resource.uri for resource in server_resources}
         
         # Should have template resources
         expected_patterns = ["screenshot://", "screenshots://recent"]
@@ -77,64 +144,38 @@ class TestCAMMCPServer:
         # At least one should be available (depending on implementation)
         assert has_screenshot_template or has_recent_resource
 
-    @pytest.mark.asyncio 
-    async def test_capture_screenshot_mock(self, client, temp_cache_dir):
+    @pytest.mark.parametrize("arguments,expected", [
+        ({"message": "test capture", "quality": 85}, {"category": "stdout"}),
+        ({"return_base64": True}, {"base64": _FAKE_IMG_B64}),
+        ({}, None),  # Capture fails
+    ], ids=["path", "base64", "failure"])
+    async def test_capture_screenshot(
+        self, client, temp_cache_dir, arguments, expected
+    ):
         """Test screenshot capture with mocked cammy."""
-        mock_path = str(temp_cache_dir / "test-stdout.jpg")
+        mock_path = _p(str(temp_cache_dir), "test-stdout.jpg")
         
         # Create a mock screenshot file
-        Path(mock_path).write_bytes(b"fake_image_data")
+        _make_fakes(temp_cache_dir, ["test-stdout.jpg"], _FAKE_IMG)
         
         with patch('mcp_server_fastmcp.cammy.capture') as mock_capture:
-            mock_capture.return_value = mock_path
-            
-            result = await client.call_tool("capture_screenshot", {
-                "message": "test capture",
-                "quality": 85
-            })
+            # None simulates a failed capture
+            mock_capture.return_value = None if expected is None else mock_path
             
-            response = json.loads(result.content[0].text)
-            
-            assert response["success"] is True
-            assert response["path"] == mock_path
-            assert response["category"] == "stdout"
-            assert "timestamp" in response
-
-    @pytest.mark.asyncio
-    async def test_capture_screenshot_with_base64(self, client, temp_cache_dir):
-        """Test screenshot capture with base64 return."""
-        mock_path = str(temp_cache_dir / "test-stdout.jpg")
-        test_data = b"fake_image_data"
-        
-        Path(mock_path).write_bytes(test_data)
+            result = await client.call_tool("capture_screenshot", arguments)
+            response = _loads(result.content[0].text)
         
-        with patch('mcp_server_fastmcp.cammy.capture') as mock_capture:
-            mock_capture.return_value = mock_path
-            
-            result = await client.call_tool("capture_screenshot", {
-                "return_base64": True
-            })
-            
-            response = json.loads(result.content[0].text)
-            
-            assert response["success"] is True
-            assert "base64" in response
-            # Should contain base64 encoded data
-            assert len(response["base64"]) > 0
-
-    @pytest.mark.asyncio
-    async def test_capture_screenshot_failure(self, client):
-        """Test screenshot capture failure handling."""
-        with patch('mcp_server_fastmcp.cammy.capture') as mock_capture:
-            mock_capture.return_value = None  # Simulate failure
-            
-            result = await client.call_tool("capture_screenshot", {})
-            response = json.loads(result.content[0].text)
-            
+        if expected is None:
             assert response["success"] is False
             assert "error" in response
+            return
+        
+        assert response["success"] is True
+        assert response["path"] == mock_path
+        assert "timestamp" in response
+        for key, value in expected.items():
+            assert response[key] == value
 
-    @pytest.mark.asyncio
     async def test_start_monitoring(self, client, temp_cache_dir):
         """Test monitoring start functionality."""
         with patch('mcp_server_fastmcp.cammy.start_monitor') as mock_start:
@@ -146,7 +187,7 @@ class TestCAMMCPServer:
                 "quality": 70
             })
             
-            response = json.loads(result.content[0].text)
+            response = _loads(result.content[0].text)
             
             assert response["success"] is True
             assert response["interval"] == 2.0
@@ -156,7 +197,6 @@ class TestCAMMCPServer:
             monitoring_file = temp_cache_dir / ".monitoring"
             assert monitoring_file.exists()
 
-    @pytest.mark.asyncio
     async def test_start_monitoring_already_active(self, client, temp_cache_dir):
         """Test starting monitoring when already active."""
         # Create monitoring file to simulate active monitoring
@@ -164,79 +204,68 @@ class TestCAMMCPServer:
         monitoring_file.write_text("active")
         
         result = await client.call_tool("start_monitoring", {})
-        response = json.loads(result.content[0].text)
+        response = _loads(result.content[0].text)
         
         assert response["success"] is False
         assert "already active" in response["message"]
 
-    @pytest.mark.asyncio
-    async def test_stop_monitoring(self, client, temp_cache_dir):
+    async def test_stop_monitoring(self, client, temp_cache_dir, monkeypatch):
         """Test monitoring stop functionality."""
         # Create monitoring file to simulate active monitoring
         monitoring_file = temp_cache_dir / ".monitoring" 
         monitoring_file.write_text("active")
         
-        with patch('mcp_server_fastmcp.cammy.stop') as mock_stop:
-            result = await client.call_tool("stop_monitoring", {})
-            response = json.loads(result.content[0].text)
-            
-            assert response["success"] is True
-            assert "stopped" in response["message"]
-            
-            # Check that monitoring file was removed
-            assert not monitoring_file.exists()
-            
-            mock_stop.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_stop_monitoring_not_active(self, client, temp_cache_dir):
-        """Test stopping monitoring when not active."""
+        calls = []
+        monkeypatch.setattr(
+            mcp_server_fastmcp.cammy, "stop", lambda *a, **k: calls.append(1)
+        )
+        
         result = await client.call_tool("stop_monitoring", {})
-        response = json.loads(result.content[0].text)
+        response = _loads(result.content[0].text)
         
-        assert response["success"] is False
-        assert "not active" in response["message"]
+        assert response["success"] is True
+        assert "stopped" in response["message"]
+        
+        # Check that monitoring file was removed
+        assert not monitoring_file.exists()
+        
+        assert len(calls) == 1
 
-    @pytest.mark.asyncio
     async def test_get_monitoring_status(self, client, temp_cache_dir):
         """Test getting monitoring status."""
         # Create some test screenshots
         test_files = [
-            temp_cache_dir / "20250824_120000_001-stdout.jpg",
-            temp_cache_dir / "20250824_120001_002-stderr.jpg"
+            "20250824_120000_001-stdout.jpg",
+            "20250824_120001_002-stderr.jpg"
         ]
         
-        for file in test_files:
-            file.write_bytes(b"fake_data" * 100)  # ~900 bytes each
+        _make_fakes(temp_cache_dir, test_files, b"fake_data" * 100)  # ~900 bytes each
         
         result = await client.call_tool("get_monitoring_status", {})
-        response = json.loads(result.content[0].text)
+        response = _loads(result.content[0].text)
         
         assert response["active"] is False  # No monitoring file exists
         assert "cache_dir" in response
         assert response["screenshot_count"] == 2
         assert response["cache_size_mb"] > 0
 
-    @pytest.mark.asyncio
     async def test_list_recent_screenshots(self, client, temp_cache_dir):
-        """Test listing recent screenshots."""
+        """Test listing recent screenshots, unfiltered and per category."""
         # Create test screenshot files with different timestamps
-        test_files = [
-            ("20250824_120000_001-stdout.jpg", "stdout"),
-            ("20250824_120001_002-stderr.jpg", "stderr"),
-            ("20250824_120002_003-stdout.jpg", "stdout")
-        ]
+        _make_fakes(temp_cache_dir, _RECENT_FILES, _FAKE_IMG)
         
-        for filename, category in test_files:
-            file_path = temp_cache_dir / filename
-            file_path.write_bytes(b"fake_image_data")
-        
-        result = await client.call_tool("list_recent_screenshots", {
-            "limit": 5,
-            "category": "all"
-        })
+        # The three listings are independent; overlap their round trips
+        results = await asyncio.gather(*(
+            client.call_tool("list_recent_screenshots", {
+                "limit": 5,
+                "category": category
+            })
+            for category in ("all", "stdout", "stderr")
+        ))
         
-        response = json.loads(result.content[0].text)
+        response, stdout, stderr = (
+            _loads(result.content[0].text) for result in results
+        )
         
         assert response["success"] is True
         assert response["count"] == 3
@@ -249,36 +278,20 @@ class TestCAMMCPServer:
             assert screenshot["category"] in ["stdout", "stderr"]
             assert "size_kb" in screenshot
             assert "modified" in screenshot
-
-    @pytest.mark.asyncio
-    async def test_list_recent_screenshots_filtered(self, client, temp_cache_dir):
-        """Test listing screenshots with category filter."""
-        # Create mixed category screenshots
-        test_files = [
-            ("test1-stdout.jpg", "stdout"),
-            ("test2-stderr.jpg", "stderr"),
-            ("test3-stdout.jpg", "stdout")
-        ]
         
-        for filename, _ in test_files:
-            (temp_cache_dir / filename).write_bytes(b"fake_data")
+        # Category filters
+        assert stdout["success"] is True
+        assert stdout["count"] == 2  # Only stdout screenshots
+        assert all(s["category"] == "stdout" for s in stdout["screenshots"])
         
-        # Test stdout filter
-        result = await client.call_tool("list_recent_screenshots", {
-            "category": "stdout"
-        })
-        
-        response = json.loads(result.content[0].text)
-        
-        assert response["success"] is True
-        assert response["count"] == 2  # Only stdout screenshots
-        assert all(s["category"] == "stdout" for s in response["screenshots"])
+        assert stderr["success"] is True
+        assert stderr["count"] == 1  # Only stderr screenshots
+        assert all(s["category"] == "stderr" for s in stderr["screenshots"])
 
-    @pytest.mark.asyncio
     async def test_analyze_screenshot(self, client, temp_cache_dir):
         """Test screenshot analysis."""
         test_file = temp_cache_dir / "test-stderr.jpg"
-        test_file.write_bytes(b"fake_image_data")
+        test_file.write_bytes(_FAKE_IMG)
         
         with patch('mcp_server_fastmcp._detect_category') as mock_detect:
             mock_detect.return_value = "stderr"
@@ -287,7 +300,7 @@ class TestCAMMCPServer:
                 "path": str(test_file)
             })
             
-            response = json.loads(result.content[0].text)
+            response = _loads(result.content[0].text)
             
             assert response["success"] is True
             assert response["category"] == "stderr"
@@ -295,30 +308,16 @@ class TestCAMMCPServer:
             assert "size_kb" in response
             assert "modified" in response
 
-    @pytest.mark.asyncio
-    async def test_analyze_screenshot_not_found(self, client):
-        """Test analyzing non-existent screenshot."""
-        result = await client.call_tool("analyze_screenshot", {
-            "path": "/nonexistent/path.jpg"
-        })
-        
-        response = json.loads(result.content[0].text)
-        
-        assert response["success"] is False
-        assert "not found" in response["error"]
-
-    @pytest.mark.asyncio
     async def test_clear_cache_all(self, client, temp_cache_dir):
         """Test clearing all cache."""
-        # Create test files
-        for i in range(3):
-            (temp_cache_dir / f"test{i}.jpg").write_bytes(b"fake_data")
+        # Create test files (only their count matters)
+        _make_fakes(temp_cache_dir, [f"test{i}.jpg" for i in range(3)], b"")
         
         result = await client.call_tool("clear_cache", {
             "clear_all": True
         })
         
-        response = json.loads(result.content[0].text)
+        response = _loads(result.content[0].text)
         
         assert response["success"] is True
         assert response["removed_count"] == 3
@@ -327,113 +326,45 @@ class TestCAMMCPServer:
         remaining_files = list(temp_cache_dir.glob("*.jpg"))
         assert len(remaining_files) == 0
 
-    @pytest.mark.asyncio
-    async def test_clear_cache_size_limit(self, client, temp_cache_dir):
+    async def test_clear_cache_size_limit(self, client, temp_cache_dir, monkeypatch):
         """Test cache size management."""
         # Create test files
-        for i in range(3):
-            (temp_cache_dir / f"test{i}.jpg").write_bytes(b"fake_data" * 1000)
+        _make_fakes(
+            temp_cache_dir, [f"test{i}.jpg" for i in range(3)], b"fake_data" * 1000
+        )
         
-        with patch('mcp_server_fastmcp._manage_cache_size') as mock_manage:
-            result = await client.call_tool("clear_cache", {
-                "max_size_gb": 0.001  # Very small limit
-            })
-            
-            response = json.loads(result.content[0].text)
-            
-            assert response["success"] is True
-            assert "cache_size_mb" in response
-            mock_manage.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_create_gif_from_session(self, client, temp_cache_dir):
-        """Test GIF creation from session."""
-        with patch('mcp_server_fastmcp.GifCreator') as mock_creator_class:
-            mock_creator = MagicMock()
-            mock_creator_class.return_value = mock_creator
-            
-            output_path = str(temp_cache_dir / "test.gif")
-            mock_creator.create_gif_from_session.return_value = output_path
-            
-            # Create the mock output file
-            Path(output_path).write_bytes(b"fake_gif_data" * 100)
-            
-            result = await client.call_tool("create_gif", {
-                "session_id": "20250824_120000",
-                "duration": 0.8
-            })
-            
-            response = json.loads(result.content[0].text)
-            
-            assert response["success"] is True
-            assert response["path"] == output_path
-            assert response["duration_per_frame"] == 0.8
-            assert "size_kb" in response
-
-    @pytest.mark.asyncio
-    async def test_create_gif_missing_params(self, client):
-        """Test GIF creation with missing parameters."""
-        result = await client.call_tool("create_gif", {})
-        response = json.loads(result.content[0].text)
+        # clear_cache imports _manage_cache_size from cammy.utils per call
+        calls = []
+        monkeypatch.setattr(
+            "cammy.utils._manage_cache_size", lambda *a, **k: calls.append(1)
+        )
         
-        assert response["success"] is False
-        assert "Must specify either" in response["error"]
-
-    @pytest.mark.asyncio
-    async def test_list_sessions(self, client, temp_cache_dir):
-        """Test listing available sessions."""
-        # Create session files
-        session_files = [
-            "20250824_120000_001.jpg",
-            "20250824_120000_002.jpg", 
-            "20250824_130000_001.jpg"
-        ]
+        result = await client.call_tool("clear_cache", {
+            "max_size_gb": 0.001  # Very small limit
+        })
         
-        for filename in session_files:
-            (temp_cache_dir / filename).write_bytes(b"fake_data" * 500)
+        response = _loads(result.content[0].text)
         
-        with patch('mcp_server_fastmcp.GifCreator') as mock_creator_class:
-            mock_creator = MagicMock()
-            mock_creator_class.return_value = mock_creator
-            mock_creator.get_recent_sessions.return_value = ["20250824_120000", "20250824_130000"]
-            
-            result = await client.call_tool("list_sessions", {"limit": 5})
-            response = json.loads(result.content[0].text)
-            
-            assert response["success"] is True
-            assert response["count"] >= 1
-            assert len(response["sessions"]) >= 1
-            
-            # Check session details structure
-            if response["sessions"]:
-                session = response["sessions"][0]
-                assert "session_id" in session
-                assert "screenshot_count" in session
-                assert "total_size_kb" in session
-                assert "start_time" in session
-                assert "end_time" in session
+        assert response["success"] is True
+        assert "cache_size_mb" in response
+        assert len(calls) == 1
 
-    @pytest.mark.asyncio
     async def test_get_screenshot_resource(self, client, temp_cache_dir):
         """Test getting screenshot resource."""
         # Create a test screenshot
         filename = "test-screenshot.jpg"
-        test_data = b"fake_image_data_for_resource_test"
-        (temp_cache_dir / filename).write_bytes(test_data)
+        (temp_cache_dir / filename).write_bytes(_FAKE_IMG)
         
         try:
             result = await client.read_resource(f"screenshot://{filename}")
             
             # The resource should return base64 encoded data
-            import base64
-            expected_b64 = base64.b64encode(test_data).decode()
-            assert result.content == expected_b64
+            assert result.content == _FAKE_IMG_B64
             
         except Exception as e:
             # If resource reading is not implemented in test client, skip
             pytest.skip(f"Resource reading not supported in test environment: {e}")
 
-    @pytest.mark.asyncio
     async def test_list_screenshots_resource(self, client, temp_cache_dir):
         """Test screenshots listing resource."""
         # Create test screenshots
@@ -442,14 +373,13 @@ class TestCAMMCPServer:
             "test2-stderr.jpg"
         ]
         
-        for filename in test_files:
-            (temp_cache_dir / filename).write_bytes(b"fake_data")
+        _make_fakes(temp_cache_dir, test_files)
         
         try:
             result = await client.read_resource("screenshots://recent")
             
             # Parse the JSON response
-            response = json.loads(result.content)
+            response = _loads(result.content)
             
             assert "screenshots" in response
             assert "count" in response
@@ -460,19 +390,106 @@ class TestCAMMCPServer:
             pytest.skip(f"Resource reading not supported in test environment: {e}")
 
 
+@pytest.mark.asyncio(loop_scope="session")
+class TestGifTools:
+    """MCP GIF tools, run against one shared GifCreator mock."""
+
+    @pytest.fixture(autouse=True)
+    def _mock_gif(self, monkeypatch):
+        """Make every GifCreator() in the server return the same mock."""
+        mock_creator = MagicMock()
+        # The tools import GifCreator from cammy.gif at call time; the
+        # module is looked up directly since cammy.gif is also a function
+        monkeypatch.setattr(
+            importlib.import_module("cammy.gif"),
+            "GifCreator",
+            lambda *args, **kwargs: mock_creator,
+        )
+        return mock_creator
+
+    async def test_create_gif_from_session(self, client, temp_cache_dir, _mock_gif):
+        """Test GIF creation from session."""
+        output_path = _p(str(temp_cache_dir), "test.gif")
+        _mock_gif.create_gif_from_session.return_value = output_path
+        
+        # Create the mock output file
+        _make_fakes(temp_cache_dir, ["test.gif"], b"fake_gif_data" * 100)
+        
+        result = await client.call_tool("create_gif", {
+            "session_id": "20250824_120000",
+            "duration": 0.8
+        })
+        
+        response = _loads(result.content[0].text)
+        
+        assert response["success"] is True
+        assert response["path"] == output_path
+        assert response["duration_per_frame"] == 0.8
+        assert "size_kb" in response
+
+    async def test_list_sessions(self, client, temp_cache_dir, _mock_gif):
+        """Test listing available sessions."""
+        # Create session files
+        _make_fakes(temp_cache_dir, _SESSION_FILES, b"fake_data" * 500)
+        
+        _mock_gif.get_recent_sessions.return_value = ["20250824_120000", "20250824_130000"]
+        
+        result = await client.call_tool("list_sessions", {"limit": 5})
+        response = _loads(result.content[0].text)
+        
+        assert response["success"] is True
+        assert response["count"] >= 1
+        assert len(response["sessions"]) >= 1
+        
+        # Check session details structure
+        if response["sessions"]:
+            session = response["sessions"][0]
+            assert "session_id" in session
+            assert "screenshot_count" in session
+            assert "total_size_kb" in session
+            assert "start_time" in session
+            assert "end_time" in session
+
+
+class TestToolErrorPaths:
+    """Trivial tool error branches, called directly instead of over MCP."""
+
+    def test_stop_monitoring_not_active(self, temp_cache_dir):
+        """Test stopping monitoring when not active."""
+        stop_monitoring = _direct(mcp_server_fastmcp.stop_monitoring)
+        response = asyncio.run(stop_monitoring())
+        
+        assert response["success"] is False
+        assert "not active" in response["message"]
+
+    def test_analyze_screenshot_not_found(self):
+        """Test analyzing non-existent screenshot."""
+        analyze_screenshot = _direct(mcp_server_fastmcp.analyze_screenshot)
+        response = analyze_screenshot("/nonexistent/path.jpg")
+        
+        assert response["success"] is False
+        assert "not found" in response["error"]
+
+    def test_create_gif_missing_params(self):
+        """Test GIF creation with missing parameters."""
+        response = _direct(mcp_server_fastmcp.create_gif)()
+        
+        assert response["success"] is False
+        assert "Must specify either" in response["error"]
+
+
 class TestMCPServerIntegration:
     """Integration tests for MCP server with real cammy functionality."""
 
     @pytest.mark.asyncio
-    async def test_server_startup(self):
+    async def test_server_startup(self, server_tools, server_resources):
         """Test that the server can start up properly."""
         async with Client(mcp) as client:
             # Basic connectivity test
-            tools = await client.list_tools()
-            assert len(tools) > 0
-            
-            resources = await client.list_resources()
-            # Resources may be empty initially, that's ok
+            await client.ping()
+
+        assert len(server_tools) > 0
+        # Resources may be empty initially, that's ok
 
     @pytest.mark.asyncio
     async def test_tool_parameter_validation(self):
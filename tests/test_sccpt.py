@@ -14,9 +14,12 @@ __DIR__ = os.path.dirname(__FILE__)
 Tests for cammy package using pytest.
 """
 
+import asyncio
+import io
 import sys
 import tempfile
 import time
+from contextlib import redirect_stdout
 
 import pytest
 
@@ -24,6 +27,18 @@ import pytest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import cammy
+from cammy.capture import ScreenshotWorker
+from cammy.utils import _normalize_message
+
+
+def _wait_until(pred, timeout, interval=0.05):
+    """Poll pred() until it is true or timeout seconds pass."""
+    deadline = time.monotonic() + timeout
+    while not pred():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+    return True
 
 
 class TestBasicCapture:
@@ -36,9 +51,10 @@ class TestBasicCapture:
         assert hasattr(cammy, "start")
         assert hasattr(cammy, "stop")
 
-    def test_single_capture(self):
+    @pytest.mark.asyncio
+    async def test_single_capture(self):
         """Test single screenshot capture."""
-        path = cammy.snap("test capture")
+        path = await asyncio.to_thread(cammy.snap, "test capture")
         assert path is not None
         assert os.path.exists(path)
         assert path.endswith("-stdout.jpg")
@@ -46,6 +62,7 @@ class TestBasicCapture:
 
     def test_error_capture(self):
         """Test automatic error detection."""
+        # Stays on this thread: the exception context is per-thread
         try:
             raise ValueError("Test error")
         except:
@@ -54,21 +71,25 @@ class TestBasicCapture:
             assert os.path.exists(path)
             assert path.endswith("-stderr.jpg")
 
-    def test_custom_path(self):
+    @pytest.mark.asyncio
+    async def test_custom_path(self):
         """Test custom output path."""
         with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
             tmp_path = tmp.name
 
-        path = cammy.snap("custom path", path=tmp_path)
+        path = await asyncio.to_thread(cammy.snap, "custom path", path=tmp_path)
         assert path == tmp_path
         assert os.path.exists(path)
 
         # Cleanup
         os.unlink(tmp_path)
 
-    def test_timestamp_placeholder(self):
+    @pytest.mark.asyncio
+    async def test_timestamp_placeholder(self):
         """Test timestamp placeholder in path."""
-        path = cammy.snap("timestamp test", path="/tmp/test-<timestamp>.jpg")
+        path = await asyncio.to_thread(
+            cammy.snap, "timestamp test", path="/tmp/test-<timestamp>.jpg"
+        )
         assert path is not None
         assert os.path.exists(path)
         assert "/tmp/test-" in path
@@ -77,10 +98,28 @@ class TestBasicCapture:
         # Cleanup
         os.unlink(path)
 
+    @pytest.mark.asyncio
+    async def test_many_captures(self):
+        """Test concurrent captures from several threads."""
+        paths = await asyncio.gather(
+            *(asyncio.to_thread(cammy.snap, f"msg{i}") for i in range(3))
+        )
+        assert all(path is not None for path in paths)
+        assert len(set(paths)) == 3
+        assert all(os.path.exists(path) for path in paths)
+
 
 class TestMonitoring:
     """Test continuous monitoring functionality."""
 
+    @pytest.fixture(autouse=True)
+    def _fake_capture(self, request, monkeypatch):
+        """Skip the real screenshot backend; the interval logic doesn't need it."""
+        if request.node.get_closest_marker("slow") is None:
+            monkeypatch.setattr(
+                ScreenshotWorker, "_capture_to", lambda self, filepath: True
+            )
+
     def test_start_stop(self):
         """Test starting and stopping monitoring."""
         # Start monitoring
@@ -89,7 +128,7 @@ class TestMonitoring:
         assert worker.running
 
         # Let it capture a few screenshots
-        time.sleep(2.5)
+        _wait_until(lambda: worker.screenshot_count >= 2, timeout=8)
 
         # Stop monitoring
         cammy.stop()
@@ -99,13 +138,24 @@ class TestMonitoring:
     def test_custom_interval(self):
         """Test custom capture interval."""
         worker = cammy.start(interval=0.5, verbose=False)
-        time.sleep(5)  # Give more time for captures
+        start = time.monotonic()
+        _wait_until(lambda: worker.screenshot_count >= 3, timeout=8)
+        elapsed = time.monotonic() - start
         cammy.stop()
 
-        # In WSL with PowerShell screenshot capture, each screenshot takes ~1.5s
-        # So in 5 seconds, we expect about 3-4 screenshots
-        # This tests that the interval is being used and monitoring is working
         assert worker.screenshot_count >= 3
+        expected_rate = 1 / 0.5
+        assert worker.screenshot_count / elapsed >= expected_rate * 0.5
+
+    @pytest.mark.slow
+    def test_real_capture(self):
+        """Test monitoring with the real screenshot backend."""
+        worker = cammy.start(interval=0.5, verbose=False)
+        # In WSL with PowerShell screenshot capture, each screenshot takes ~1.5s
+        _wait_until(lambda: worker.screenshot_count >= 2, timeout=8)
+        cammy.stop()
+
+        assert worker.screenshot_count >= 2
 
 
 class TestCacheManagement:
@@ -118,6 +168,211 @@ class TestCacheManagement:
         path = cammy.snap("cache test", max_cache_gb=0.001)  # Very small limit
         assert path is not None
 
+    def test_quota_enforced_before_return(self, tmp_path, monkeypatch):
+        """Test that old files are evicted by the time capture() returns."""
+        from PIL import Image
+
+        def fake_capture(self, filepath):
+            Image.new("RGB", (16, 16), "white").save(filepath, "JPEG")
+            return True
+
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.setattr(ScreenshotWorker, "_capture_to", fake_capture)
+
+        cache_dir = tmp_path / ".cache" / "cammy"
+        cache_dir.mkdir(parents=True)
+        for i in range(200):
+            old = cache_dir / f"old_{i:03d}.jpg"
+            old.write_bytes(b"x" * 1024)
+            os.utime(old, (i, i))
+
+        limit = 64 * 1024
+        path = cammy.snap("quota", max_cache_gb=limit / 1024**3, verbose=False)
+        assert path is not None
+        assert os.path.exists(path)
+        total = sum(f.stat().st_size for f in cache_dir.glob("*.jpg"))
+        assert total <= limit
+
+
+class TestCategoryDetection:
+    """Test colour-based screenshot categorization."""
+
+    def test_thin_red_text(self, tmp_path):
+        """Test that red error text is detected, not blurred away."""
+        from PIL import Image, ImageDraw, ImageFont
+        from cammy.utils import _detect_category
+
+        try:
+            font = ImageFont.load_default(size=28)
+        except TypeError:
+            pytest.skip("Pillow < 10.1 has no sized default font")
+
+        img = Image.new("RGB", (1920, 1080), (30, 30, 30))
+        draw = ImageDraw.Draw(img)
+        line = "Traceback (most recent call last): ValueError: Error " * 3
+        for y in range(0, 1080, 30):
+            draw.text((0, y), line, fill=(255, 0, 0), font=font)
+
+        # Neutral name, so only the pixels can make it an error
+        path = tmp_path / "terminal.png"
+        img.save(path)
+        assert _detect_category(str(path)) == "error"
+
+
+class TestMetadataSplice:
+    """Test EXIF message splicing into saved captures."""
+
+    @staticmethod
+    def _sample(path, fmt, **save_kwargs):
+        """Save a small gradient image and return its decoded pixels."""
+        from PIL import Image
+
+        img = Image.new("RGB", (64, 48))
+        img.putdata([(x * 4, y * 5, 128) for y in range(48) for x in range(64)])
+        img.save(path, fmt, **save_kwargs)
+        with Image.open(path) as saved:
+            return saved.convert("RGB").tobytes()
+
+    @staticmethod
+    def _exif_message(path):
+        from PIL import Image
+        from cammy.utils import _USER_COMMENT_TAG
+
+        with Image.open(path) as img:
+            return img.getexif()[_USER_COMMENT_TAG], img.convert("RGB").tobytes()
+
+    @pytest.mark.parametrize("jfif", [True, False], ids=["jfif", "no-jfif"])
+    def test_jpeg_round_trip(self, tmp_path, jfif):
+        """Test that the EXIF segment is spliced in without re-encoding."""
+        from PIL import Image
+        from cammy.utils import _USER_COMMENT_TAG, _splice_jpeg_exif
+
+        path = tmp_path / "shot.jpg"
+        pixels = self._sample(path, "JPEG", quality=85)
+        data = path.read_bytes()
+        assert data[2:4] == b"\xff\xe0"  # PIL writes a JFIF APP0
+        app0_end = 4 + int.from_bytes(data[4:6], "big")
+        if not jfif:
+            data = data[:2] + data[app0_end:]
+            path.write_bytes(data)
+            app0_end = 2
+
+        exif = Image.Exif()
+        exif[_USER_COMMENT_TAG] = "[STDERR] boom"
+        assert _splice_jpeg_exif(str(path), exif)
+
+        spliced = path.read_bytes()
+        # APP1 lands right after SOI, or after the JFIF APP0 when present
+        assert spliced[:app0_end] == data[:app0_end]
+        assert spliced[app0_end : app0_end + 2] == b"\xff\xe1"
+        assert self._exif_message(path) == ("[STDERR] boom", pixels)
+        assert not list(tmp_path.glob(".*.tmp"))
+
+    def test_png_round_trip(self, tmp_path):
+        """Test that a valid eXIf chunk is inserted before the image data."""
+        import zlib
+
+        from PIL import Image
+        from cammy.utils import _USER_COMMENT_TAG, _splice_png_exif
+
+        path = tmp_path / "shot.png"
+        pixels = self._sample(path, "PNG")
+
+        exif = Image.Exif()
+        exif[_USER_COMMENT_TAG] = "[STDOUT] done"
+        assert _splice_png_exif(str(path), exif)
+
+        data = path.read_bytes()
+        chunks = []
+        pos = 8
+        while pos < len(data):
+            length = int.from_bytes(data[pos : pos + 4], "big")
+            body = data[pos + 4 : pos + 8 + length]
+            crc = int.from_bytes(data[pos + 8 + length : pos + 12 + length], "big")
+            chunks.append(body[:4])
+            if body[:4] == b"eXIf":
+                assert zlib.crc32(body) == crc
+            pos += 12 + length
+        assert chunks.index(b"eXIf") < chunks.index(b"IDAT")
+        assert self._exif_message(path) == ("[STDOUT] done", pixels)
+        assert not list(tmp_path.glob(".*.tmp"))
+
+        # A second splice is refused rather than adding a duplicate chunk
+        assert not _splice_png_exif(str(path), exif)
+
+    def test_jpeg_with_exif_falls_back(self, tmp_path):
+        """Test that a JPEG already carrying EXIF is re-saved by PIL."""
+        from PIL import Image
+        from cammy.utils import (
+            _USER_COMMENT_TAG,
+            _add_message_metadata,
+            _splice_jpeg_exif,
+        )
+
+        existing = Image.Exif()
+        existing[0x010E] = "existing"  # ImageDescription
+        path = tmp_path / "shot.jpg"
+        self._sample(path, "JPEG", exif=existing)
+
+        exif = Image.Exif()
+        exif[_USER_COMMENT_TAG] = "message"
+        assert not _splice_jpeg_exif(str(path), exif)
+
+        _add_message_metadata(str(path), "message")
+        with Image.open(path) as img:
+            assert img.getexif()[_USER_COMMENT_TAG] == "message"
+            assert img.getexif()[0x010E] == "existing"
+        assert not list(tmp_path.glob(".*.tmp"))
+
+
+class TestGif:
+    """Test GIF creation from captured frames."""
+
+    @staticmethod
+    def _frames():
+        """Return three frames with a static grid and two moving squares."""
+        from PIL import Image, ImageDraw
+
+        base = Image.new("RGB", (160, 120), "white")
+        draw = ImageDraw.Draw(base)
+        for y in range(0, 120, 4):
+            draw.line((0, y, 159, y), fill=(y * 2, 100, 255 - y * 2))
+        for x in range(0, 160, 5):
+            draw.line((x, 0, x, 119), fill=(100, x, 255 - x))
+
+        frames = []
+        for i in range(3):
+            frame = base.copy()
+            draw = ImageDraw.Draw(frame)
+            # Opposite corners, so the changed bbox covers the whole frame
+            draw.rectangle((i * 10, 0, i * 10 + 7, 7), fill=(255, 0, 0))
+            draw.rectangle(
+                (152 - i * 10, 112, 159 - i * 10, 119), fill=(0, 0, 255)
+            )
+            frames.append(frame)
+        return frames
+
+    def test_shared_palette(self, tmp_path):
+        """Test that shared_palette round-trips pixels and shrinks the file."""
+        import importlib
+
+        from PIL import Image, ImageSequence
+
+        creator = importlib.import_module("cammy.gif").GifCreator()
+        frames = self._frames()
+        shared = tmp_path / "shared.gif"
+        plain = tmp_path / "plain.gif"
+        creator.create_gif_from_images(frames, str(shared), shared_palette=True)
+        creator.create_gif_from_images(frames, str(plain), shared_palette=False)
+
+        with Image.open(shared) as img:
+            decoded = [
+                frame.convert("RGB").tobytes()
+                for frame in ImageSequence.Iterator(img)
+            ]
+        assert decoded == [frame.tobytes() for frame in frames]
+        assert shared.stat().st_size < plain.stat().st_size
+
 
 class TestMultiMonitor:
     """Test multi-monitor support."""
@@ -147,34 +402,83 @@ class TestFilenameNormalization:
         assert "!" not in path
         assert "Test-with-spaces-symbols" in path
 
-    def test_long_message(self):
-        """Test that long messages are truncated."""
-        long_msg = "x" * 100
-        path = cammy.snap(long_msg)
-        assert path is not None
-        # Message should be truncated to 50 chars
-        filename = os.path.basename(path)
-        assert len(filename) < 150  # Reasonable filename length
+    @pytest.mark.parametrize(
+        "message,expected",
+        [
+            ("Test with spaces & symbols!@#$%", "-Test-with-spaces-symbols"),
+            # Long messages are truncated to 50 chars
+            ("x" * 100, "-" + "x" * 50),
+            ("first line\nsecond line", "-first-line"),
+            ("  --spaced -- out--  ", "-spaced-out"),
+            ("!@#$%", ""),
+            (None, ""),
+        ],
+        ids=["symbols", "long", "multiline", "dashes", "only-symbols", "none"],
+    )
+    def test_normalize_message(self, message, expected):
+        """Test the message-to-filename fragment without capturing."""
+        assert _normalize_message(message) == expected
 
 
 class TestVerbosity:
     """Test verbose output control."""
 
-    def test_verbose_false(self, capsys):
+    def test_verbose_false(self):
         """Test that verbose=False suppresses output."""
-        path = cammy.capture("quiet test", verbose=False)
-        captured = capsys.readouterr()
-        assert "📸" not in captured.out
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            path = cammy.capture("quiet test", verbose=False)
+        assert "📸" not in buf.getvalue()
         assert path is not None
 
-    def test_verbose_true(self, capsys):
+    def test_verbose_true(self):
         """Test that verbose=True shows output."""
-        path = cammy.capture("verbose test", verbose=True)
-        captured = capsys.readouterr()
-        assert "📸" in captured.out
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            path = cammy.capture("verbose test", verbose=True)
+        assert "📸" in buf.getvalue()
         assert path is not None
 
 
+class TestCLIHelp:
+    """Test the pre-rendered CLI help text."""
+
+    def test_help_text_matches_parser(self, monkeypatch):
+        """Test that _HELP_TEXT is in sync with the argparse definition."""
+        from cammy import cli
+
+        low, high = cli._HELP_TEXT_PYTHON
+        if not low <= sys.version_info[:2] < high:
+            pytest.skip("_HELP_TEXT is only used on the versions it matches")
+        monkeypatch.setenv("COLUMNS", "80")
+        assert cli._HELP_TEXT == cli._get_parser().format_help()
+
+    def test_help_skips_argparse(self, capsys):
+        """Test that --help prints the static text and exits cleanly."""
+        from cammy import cli
+
+        assert cli.main(["--help"]) == 0
+        assert capsys.readouterr().out.startswith("usage: cammy")
+
+    @pytest.mark.parametrize("argv", [[], ["--stop"], ["-q", "--all"]])
+    def test_fast_parse_matches_parser(self, argv):
+        """Test that the fast path builds the same namespace as argparse."""
+        from cammy import cli
+
+        args = cli._fast_parse(argv)
+        assert args is not None
+        assert vars(args) == vars(cli._get_parser().parse_args(argv))
+
+    @pytest.mark.parametrize(
+        "argv", [["--stop", "--list"], ["--interval", "2"], ["msg"]]
+    )
+    def test_fast_parse_falls_back(self, argv):
+        """Test that anything beyond one bare action goes to argparse."""
+        from cammy import cli
+
+        assert cli._fast_parse(argv) is None
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 